@@ -2,81 +2,273 @@
 Improved cross-lingual semantic similarity analysis.
 Uses dual embeddings with weighted scoring and lexical overlap filtering.
 """
+import os
+
+# Split BLAS threads between the three language-pair workers; each one
+# spawning a full-width thread pool would oversubscribe the machine
+# 3x. Set in the environment before NumPy loads its BLAS, and only as
+# a default so a single-pair run can override it externally.
+_blas_threads = str(max(1, (os.cpu_count() or 3) // 3))
+os.environ.setdefault('OMP_NUM_THREADS', _blas_threads)
+os.environ.setdefault('OPENBLAS_NUM_THREADS', _blas_threads)
+os.environ.setdefault('MKL_NUM_THREADS', _blas_threads)
+
+import sys
 import pickle
 import json
 import csv
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 import re
 from collections import Counter
 
+sys.path.insert(0, os.path.dirname(__file__))
+
+from idiom_similarity import normalize_embeddings, quantize_embeddings_int8, simsimd
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    from safetensors.numpy import load_file as safetensors_load
+except ImportError:
+    safetensors_load = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fuse_weighted_tile(idiom_sims, context_sims, overlap, out,
+                            idiom_weight, context_weight, lexical_penalty):
+        """Weighted sum plus lexical penalty in one pass, no temporaries."""
+        n, m = idiom_sims.shape
+        for i in prange(n):
+            for j in range(m):
+                w = idiom_weight * idiom_sims[i, j] + context_weight * context_sims[i, j]
+                if lexical_penalty:
+                    o = overlap[i, j]
+                    if o > 0.3 and w > 0.6:
+                        w *= 1 - (o * 0.5)
+                out[i, j] = w
+
+
+def prepare_target_matrix(b):
+    """Prepare the target side of the tiled similarity pass once.
+
+    Normalizes and then uploads (GPU) or int8-quantizes (SimSIMD) the
+    full target matrix a single time, so each row tile pays only for
+    its own side instead of re-preparing — and on GPU re-transferring —
+    the target per tile.
+    """
+    b = normalize_embeddings(b)
+
+    if torch is not None and torch.cuda.is_available():
+        return torch.from_numpy(b).to('cuda', dtype=torch.float16)
+
+    if simsimd is not None:
+        # int8 cosine on VNNI/NEON: quarter the bandwidth of fp32, and
+        # the per-vector quantization scales cancel out of cosine
+        return quantize_embeddings_int8(b)
+
+    return b
+
+
+def cosine_similarity_matrix(a, b_prepared):
+    """Cosine similarities against a prepared target matrix.
+
+    sklearn's cosine_similarity re-normalizes and upcasts to fp64 on
+    every call; normalizing once and multiplying stays in single
+    precision, and runs as an fp16 tensor-core matmul when a GPU is
+    available. b_prepared must come from prepare_target_matrix.
+    """
+    a = normalize_embeddings(a)
+
+    if torch is not None and torch.cuda.is_available():
+        a_g = torch.from_numpy(a).to('cuda', dtype=torch.float16)
+        return (a_g @ b_prepared.T).float().cpu().numpy()
+
+    if simsimd is not None:
+        a8 = quantize_embeddings_int8(a)
+        return (1.0 - np.asarray(simsimd.cdist(a8, b_prepared, metric='cosine'))).astype(np.float32)
+
+    return a @ b_prepared.T
+
+
+TILE_ROWS = 1024  # English rows per tile; bounds the live similarity slabs
+
 
 def load_dual_embeddings(embedding_file):
-    """Load saved dual embeddings."""
-    with open(embedding_file, 'rb') as f:
-        data = pickle.load(f)
-    return data
+    """Load saved dual embeddings.
+
+    Prefers a zero-copy mmap'd .safetensors file, then an .npz of
+    contiguous float32 arrays, each with a JSON idiom sidecar,
+    converting the legacy pickle once on first use — load
+    becomes two array reads instead of a full unpickle of every idiom
+    dict, and the arrays feed BLAS sgemm without an fp64 upcast.
+    """
+    embedding_file = Path(embedding_file)
+    st_file = embedding_file.with_suffix('.safetensors')
+    npz_file = embedding_file.with_suffix('.npz')
+    idioms_file = embedding_file.with_suffix('.idioms.json')
+
+    if safetensors_load is not None and st_file.exists() and idioms_file.exists():
+        # safetensors mmaps the tensor region zero-copy — consumers pay
+        # only for the pages they touch
+        arrays = safetensors_load(str(st_file))
+        with open(idioms_file, 'r', encoding='utf-8') as f:
+            idioms = json.load(f)
+        return {
+            'idioms': idioms,
+            'idiom_only_embeddings': arrays['idiom_only'],
+            'idiom_context_embeddings': arrays['idiom_context']
+        }
+
+    if not (npz_file.exists() and idioms_file.exists()):
+        # One-time conversion so later runs skip the unpickler entirely.
+        # Written to temp files and published with os.replace: the three
+        # language-pair workers all convert the shared English pickle on
+        # the first post-migration run, and a concurrent reader must see
+        # either no file (and convert itself) or a complete one — never
+        # a truncated archive or torn JSON.
+        with open(embedding_file, 'rb') as f:
+            data = pickle.load(f)
+        tmp_npz = npz_file.with_name(npz_file.name + f'.{os.getpid()}.tmp')
+        tmp_idioms = idioms_file.with_name(idioms_file.name + f'.{os.getpid()}.tmp')
+        with open(tmp_npz, 'wb') as f:
+            np.savez(
+                f,
+                idiom_only=np.ascontiguousarray(data['idiom_only_embeddings'], dtype=np.float32),
+                idiom_context=np.ascontiguousarray(data['idiom_context_embeddings'], dtype=np.float32)
+            )
+        with open(tmp_idioms, 'w', encoding='utf-8') as f:
+            json.dump(data['idioms'], f, ensure_ascii=False)
+        os.replace(tmp_idioms, idioms_file)
+        os.replace(tmp_npz, npz_file)
+
+    arrays = np.load(npz_file)
+    with open(idioms_file, 'r', encoding='utf-8') as f:
+        idioms = json.load(f)
+    return {
+        'idioms': idioms,
+        'idiom_only_embeddings': arrays['idiom_only'],
+        'idiom_context_embeddings': arrays['idiom_context']
+    }
+
+
+_TOKEN_RE = re.compile(r'\b\w+\b')
 
 
 def get_tokens(text):
     """Extract tokens from text (lowercase, alphanumeric only)."""
-    # Remove punctuation and convert to lowercase
-    text = text.lower()
-    tokens = re.findall(r'\b\w+\b', text)
-    return set(tokens)
+    return frozenset(_TOKEN_RE.findall(text.lower()))
 
 
-def calculate_lexical_overlap(idiom1, idiom2):
+def calculate_lexical_overlap(tokens1, tokens2):
     """
-    Calculate lexical overlap ratio between two idioms.
+    Calculate lexical overlap ratio between two token sets.
     Returns ratio of shared tokens to total unique tokens.
-    """
-    tokens1 = get_tokens(idiom1)
-    tokens2 = get_tokens(idiom2)
 
+    Takes pre-tokenized sets (see get_tokens) so callers tokenize each
+    idiom once instead of once per pair.
+    """
     if not tokens1 or not tokens2:
         return 0.0
 
-    shared = tokens1.intersection(tokens2)
-    total = tokens1.union(tokens2)
+    # Most cross-lingual pairs share no tokens; isdisjoint exits early
+    # without building any temporary set
+    if tokens1.isdisjoint(tokens2):
+        return 0.0
+
+    # |union| = |a| + |b| - |intersection|, so only the intersection
+    # set is ever materialized
+    shared = len(tokens1 & tokens2)
+    return shared / (len(tokens1) + len(tokens2) - shared)
+
 
-    return len(shared) / len(total) if total else 0.0
+def build_bloom_signatures(token_sets):
+    """Pack each idiom's tokens into a 64-bit Bloom signature.
 
+    The signature is the OR of one hash-selected bit per token, so a
+    zero AND between two signatures proves the token sets are disjoint.
+    """
+    sigs = np.zeros(len(token_sets), dtype=np.uint64)
+    for i, tokens in enumerate(token_sets):
+        sig = 0
+        for tok in tokens:
+            sig |= 1 << (hash(tok) & 63)
+        sigs[i] = sig
+    return sigs
+
+
+def overlap_matrix(en_tokens, tgt_tokens, en_sigs, tgt_sigs):
+    """Pairwise Jaccard overlap with a Bloom-signature prefilter.
 
-def compute_weighted_similarity(idiom_only_sim, context_sim,
-                                idiom1, idiom2,
-                                idiom_weight=0.6, context_weight=0.4,
-                                lexical_penalty=True):
+    Most cross-lingual pairs share no tokens, and for those one
+    vectorized uint64 AND settles it; the exact Jaccard runs only on
+    the candidate cells (a false positive just computes an exact 0).
     """
-    Compute weighted similarity with optional lexical overlap penalty.
+    overlap = np.zeros((len(en_tokens), len(tgt_tokens)), dtype=np.float32)
+    candidates = np.argwhere(np.bitwise_and(en_sigs[:, None], tgt_sigs[None, :]) != 0)
+    for i, j in candidates:
+        overlap[i, j] = calculate_lexical_overlap(en_tokens[i], tgt_tokens[j])
+    return overlap
+
+
+def compute_weighted_matrix(idiom_only_sims, context_sims, overlap,
+                            idiom_weight=0.6, context_weight=0.4,
+                            lexical_penalty=True):
+    """
+    Compute the full weighted similarity matrix with the lexical overlap penalty.
+
+    The weighted sum is two whole-matrix ufunc calls instead of an
+    N×M Python loop, and the penalty is applied branchlessly from the
+    precomputed overlap matrix.
 
     Args:
-        idiom_only_sim: Similarity between idiom-only embeddings
-        context_sim: Similarity between idiom+context embeddings
-        idiom1, idiom2: The actual idiom texts
+        idiom_only_sims: N×M similarities between idiom-only embeddings
+        context_sims: N×M similarities between idiom+context embeddings
+        overlap: N×M lexical overlap matrix (see overlap_matrix)
         idiom_weight: Weight for idiom-only similarity (default 0.6)
         context_weight: Weight for context similarity (default 0.4)
         lexical_penalty: Whether to penalize high lexical overlap (default True)
 
     Returns:
-        Weighted similarity score (0-1)
+        N×M weighted similarity matrix
     """
-    # Base weighted score
-    weighted_score = (idiom_weight * idiom_only_sim) + (context_weight * context_sim)
+    if njit is not None:
+        # Fused SIMD kernel: weighted sum, penalty test, and store in a
+        # single sweep with no boolean-mask temporaries
+        weighted = np.empty(idiom_only_sims.shape, dtype=np.float32)
+        _fuse_weighted_tile(
+            np.ascontiguousarray(idiom_only_sims, dtype=np.float32),
+            np.ascontiguousarray(context_sims, dtype=np.float32),
+            np.ascontiguousarray(overlap, dtype=np.float32),
+            weighted, idiom_weight, context_weight, lexical_penalty)
+        return weighted
+
+    # Stay in single precision even if a caller passes fp64 similarities
+    weighted = np.asarray(
+        idiom_weight * idiom_only_sims + context_weight * context_sims,
+        dtype=np.float32)
 
-    # Apply lexical overlap penalty if enabled
     if lexical_penalty:
-        overlap = calculate_lexical_overlap(idiom1, idiom2)
-
-        # If overlap > 0.3 but similarity is high, penalize
+        # If overlap > 0.3 but similarity is high, penalize (max 50%)
         # This catches cases like "ear" matching all idioms with "ear"
-        if overlap > 0.3 and weighted_score > 0.6:
-            # Reduce score proportionally to overlap
-            penalty_factor = 1 - (overlap * 0.5)  # Max 50% penalty
-            weighted_score *= penalty_factor
+        mask = (overlap > 0.3) & (weighted > 0.6)
+        weighted[mask] *= 1 - (overlap[mask] * 0.5)
 
-    return weighted_score
+    return weighted
 
 
 def analyze_language_pair(en_idioms, en_embeddings,
@@ -102,62 +294,99 @@ def analyze_language_pair(en_idioms, en_embeddings,
     print(f"English idioms: {len(en_idioms):,}")
     print(f"{lang_name} idioms: {len(target_idioms):,}")
 
-    # Compute both similarity matrices
-    idiom_only_sims = cosine_similarity(
-        en_embeddings['idiom_only_embeddings'],
-        target_embeddings['idiom_only_embeddings']
-    )
-
-    context_sims = cosine_similarity(
-        en_embeddings['idiom_context_embeddings'],
-        target_embeddings['idiom_context_embeddings']
-    )
-
-    print(f"✓ Computed dual similarity matrices: {idiom_only_sims.shape}")
-
-    # Find top matches with weighted scoring
+    # Struct-of-arrays views of the metadata: every output row below is
+    # plain list indexing, with the first-element-or-empty guard
+    # evaluated once per idiom
+    en_idiom_strs = [d['idiom'] for d in en_idioms]
+    en_ctx_strs = [(d['contexts'] or [''])[0] for d in en_idioms]
+    tgt_idiom_strs = [d['idiom'] for d in target_idioms]
+    tgt_ctx_strs = [(d['contexts'] or [''])[0] for d in target_idioms]
+    tgt_trans_strs = [(d.get('english_translations') or [''])[0] for d in target_idioms]
+
+    # Tokenize each idiom exactly once; every overlap check below is
+    # two set lookups instead of a regex pass per pair
+    en_tokens = [get_tokens(s) for s in en_idiom_strs]
+    tgt_tokens = [get_tokens(s) for s in tgt_idiom_strs]
+
+    # 64-bit Bloom signatures: one vectorized AND per tile rules out
+    # the (vast) zero-overlap majority before any exact set work
+    en_sigs = build_bloom_signatures(en_tokens)
+    tgt_sigs = build_bloom_signatures(tgt_tokens)
+
+    # Normalize each embedding matrix once so the tile similarities
+    # are plain dot products
+    en_io = normalize_embeddings(en_embeddings['idiom_only_embeddings'])
+    en_ic = normalize_embeddings(en_embeddings['idiom_context_embeddings'])
+    tgt_io = normalize_embeddings(target_embeddings['idiom_only_embeddings'])
+    tgt_ic = normalize_embeddings(target_embeddings['idiom_context_embeddings'])
+
+    # Compute both similarity matrices tile by tile: only the weighted
+    # matrix is kept whole, the idiom-only and context slabs live one
+    # tile at a time instead of as two extra N×M matrices
     print(f"\nComputing weighted scores with lexical filtering...")
 
-    all_matches = []
-
-    for en_idx in range(len(en_idioms)):
-        en_idiom = en_idioms[en_idx]['idiom']
-
-        for tgt_idx in range(len(target_idioms)):
-            tgt_idiom = target_idioms[tgt_idx]['idiom']
-
-            # Get base similarities
-            idiom_sim = idiom_only_sims[en_idx, tgt_idx]
-            context_sim = context_sims[en_idx, tgt_idx]
-
-            # Compute weighted similarity with lexical penalty
-            weighted_sim = compute_weighted_similarity(
-                idiom_sim, context_sim,
-                en_idiom, tgt_idiom,
-                idiom_weight, context_weight,
-                lexical_penalty=True
-            )
-
-            # Only include if above threshold
-            if weighted_sim >= min_threshold:
-                lexical_overlap = calculate_lexical_overlap(en_idiom, tgt_idiom)
-
-                all_matches.append({
-                    'english_idiom': en_idiom,
-                    'english_context': en_idioms[en_idx]['contexts'][0] if en_idioms[en_idx]['contexts'] else '',
-                    f'{lang_code}_idiom': tgt_idiom,
-                    f'{lang_code}_context': target_idioms[tgt_idx]['contexts'][0] if target_idioms[tgt_idx]['contexts'] else '',
-                    'english_translation': target_idioms[tgt_idx]['english_translations'][0] if target_idioms[tgt_idx]['english_translations'] else '',
-                    'weighted_similarity': float(weighted_sim),
-                    'idiom_only_similarity': float(idiom_sim),
-                    'context_similarity': float(context_sim),
-                    'lexical_overlap': float(lexical_overlap)
-                })
+    weighted_sims = np.empty((len(en_idioms), len(target_idioms)), dtype=np.float32)
+
+    # Quantize/upload the target side once for the whole pair; the
+    # tile loop only prepares its own row slice
+    tgt_io_prep = prepare_target_matrix(tgt_io)
+    tgt_ic_prep = prepare_target_matrix(tgt_ic)
+
+    for i0 in range(0, len(en_idioms), TILE_ROWS):
+        i1 = min(i0 + TILE_ROWS, len(en_idioms))
+        idiom_tile = cosine_similarity_matrix(en_io[i0:i1], tgt_io_prep)
+        context_tile = cosine_similarity_matrix(en_ic[i0:i1], tgt_ic_prep)
+        overlap_tile = overlap_matrix(en_tokens[i0:i1], tgt_tokens, en_sigs[i0:i1], tgt_sigs)
+        weighted_sims[i0:i1] = compute_weighted_matrix(
+            idiom_tile, context_tile, overlap_tile,
+            idiom_weight, context_weight,
+            lexical_penalty=True
+        )
 
-    # Sort by weighted similarity
-    all_matches_sorted = sorted(all_matches, key=lambda x: x['weighted_similarity'], reverse=True)
+    # The whole pipeline is meant to run in single precision; a silent
+    # fp64 upcast would double memory and halve GEMM throughput
+    assert weighted_sims.dtype == np.float32
+    print(f"✓ Computed weighted similarity matrix: {weighted_sims.shape}")
+
+    def pair_sims(en_idx, tgt_idx):
+        """Recompute one pair's idiom-only and context similarities."""
+        return (float(en_io[en_idx] @ tgt_io[tgt_idx]),
+                float(en_ic[en_idx] @ tgt_ic[tgt_idx]))
+
+    # Gather only the above-threshold cells as flat index/score arrays;
+    # dict rows are built solely for the 100 survivors that get written
+    survivors = np.argwhere(weighted_sims >= min_threshold)
+    surv_en = survivors[:, 0]
+    surv_tgt = survivors[:, 1]
+    surv_scores = weighted_sims[surv_en, surv_tgt]
+    num_matches = len(surv_scores)
+
+    top_k = min(100, num_matches)
+    if top_k:
+        part = np.argpartition(surv_scores, -top_k)[-top_k:]
+        top_order = part[np.argsort(-surv_scores[part])]
+    else:
+        top_order = []
+
+    all_matches_sorted = []
+    for s in top_order:
+        en_idx = int(surv_en[s])
+        tgt_idx = int(surv_tgt[s])
+        idiom_sim, context_sim = pair_sims(en_idx, tgt_idx)
+
+        all_matches_sorted.append({
+            'english_idiom': en_idiom_strs[en_idx],
+            'english_context': en_ctx_strs[en_idx],
+            f'{lang_code}_idiom': tgt_idiom_strs[tgt_idx],
+            f'{lang_code}_context': tgt_ctx_strs[tgt_idx],
+            'english_translation': tgt_trans_strs[tgt_idx],
+            'weighted_similarity': float(surv_scores[s]),
+            'idiom_only_similarity': idiom_sim,
+            'context_similarity': context_sim,
+            'lexical_overlap': float(calculate_lexical_overlap(en_tokens[en_idx], tgt_tokens[tgt_idx]))
+        })
 
-    print(f"✓ Found {len(all_matches_sorted):,} matches above threshold {min_threshold:.2f}")
+    print(f"✓ Found {num_matches:,} matches above threshold {min_threshold:.2f}")
 
     # Display top 30
     print(f"\n{'=' * 80}")
@@ -196,44 +425,47 @@ def analyze_language_pair(en_idioms, en_embeddings,
 
     target_best_matches = []
 
+    if faiss is not None:
+        # Retrieve 20 English candidates per target by idiom-only inner
+        # product, then re-rank just those with the exact weighted +
+        # penalty score — O(M·20) instead of a full column sweep, and
+        # the index scales sublinearly as the idiom lists grow
+        index = faiss.IndexFlatIP(en_io.shape[1])
+        index.add(en_io)
+        _, cand_idx = index.search(tgt_io, min(20, len(en_idioms)))
+
+        best_en_per_tgt = np.empty(len(target_idioms), dtype=np.int64)
+        best_scores = np.empty(len(target_idioms), dtype=np.float32)
+        for tgt_idx in range(len(target_idioms)):
+            cands = cand_idx[tgt_idx]
+            col = weighted_sims[cands, tgt_idx]
+            best = int(col.argmax())
+            best_en_per_tgt[tgt_idx] = cands[best]
+            best_scores[tgt_idx] = col[best]
+    else:
+        # One column-wise argmax replaces the N-iteration Python scan
+        # per target idiom
+        best_en_per_tgt = weighted_sims.argmax(axis=0)
+        best_scores = weighted_sims[best_en_per_tgt, np.arange(len(target_idioms))]
+
     for tgt_idx, tgt_idiom_data in enumerate(target_idioms):
         tgt_idiom = tgt_idiom_data['idiom']
+        best_en_idx = int(best_en_per_tgt[tgt_idx])
+        best_score = float(best_scores[tgt_idx])
 
-        best_score = -1
-        best_en_idx = -1
-        best_idiom_sim = 0
-        best_context_sim = 0
-
-        for en_idx in range(len(en_idioms)):
-            en_idiom = en_idioms[en_idx]['idiom']
-
-            idiom_sim = idiom_only_sims[en_idx, tgt_idx]
-            context_sim = context_sims[en_idx, tgt_idx]
-
-            weighted_sim = compute_weighted_similarity(
-                idiom_sim, context_sim,
-                en_idiom, tgt_idiom,
-                idiom_weight, context_weight,
-                lexical_penalty=True
-            )
-
-            if weighted_sim > best_score:
-                best_score = weighted_sim
-                best_en_idx = en_idx
-                best_idiom_sim = idiom_sim
-                best_context_sim = context_sim
+        best_idiom_sim, best_context_sim = pair_sims(best_en_idx, tgt_idx)
 
         lexical_overlap = calculate_lexical_overlap(
-            en_idioms[best_en_idx]['idiom'],
-            tgt_idiom
+            en_tokens[best_en_idx],
+            tgt_tokens[tgt_idx]
         )
 
         target_best_matches.append({
             f'{lang_code}_idiom': tgt_idiom,
-            f'{lang_code}_context': tgt_idiom_data['contexts'][0] if tgt_idiom_data['contexts'] else '',
-            'english_translation': tgt_idiom_data['english_translations'][0] if tgt_idiom_data['english_translations'] else '',
-            'best_english_match': en_idioms[best_en_idx]['idiom'],
-            'english_context': en_idioms[best_en_idx]['contexts'][0] if en_idioms[best_en_idx]['contexts'] else '',
+            f'{lang_code}_context': tgt_ctx_strs[tgt_idx],
+            'english_translation': tgt_trans_strs[tgt_idx],
+            'best_english_match': en_idiom_strs[best_en_idx],
+            'english_context': en_ctx_strs[best_en_idx],
             'weighted_similarity': float(best_score),
             'idiom_only_similarity': float(best_idiom_sim),
             'context_similarity': float(best_context_sim),
@@ -263,24 +495,25 @@ def analyze_language_pair(en_idioms, en_embeddings,
     print("QUALITY METRICS")
     print("=" * 80)
 
-    # Analyze matches above threshold
-    weighted_scores = [m['weighted_similarity'] for m in all_matches_sorted]
-    idiom_scores = [m['idiom_only_similarity'] for m in all_matches_sorted]
-    context_scores = [m['context_similarity'] for m in all_matches_sorted]
-    overlaps = [m['lexical_overlap'] for m in all_matches_sorted]
+    # Analyze all matches above threshold on flat arrays — the full
+    # survivor set never exists as dicts
+    if num_matches:
+        idiom_scores = np.einsum('ij,ij->i', en_io[surv_en], tgt_io[surv_tgt])
+        context_scores = np.einsum('ij,ij->i', en_ic[surv_en], tgt_ic[surv_tgt])
+        overlaps = np.array([calculate_lexical_overlap(en_tokens[i], tgt_tokens[j])
+                             for i, j in zip(surv_en, surv_tgt)])
 
-    if weighted_scores:
         print(f"\nMatches above threshold ({min_threshold:.2f}):")
-        print(f"  Count: {len(weighted_scores):,}")
-        print(f"  Weighted similarity:  Mean={np.mean(weighted_scores):.4f}, Median={np.median(weighted_scores):.4f}")
+        print(f"  Count: {num_matches:,}")
+        print(f"  Weighted similarity:  Mean={np.mean(surv_scores):.4f}, Median={np.median(surv_scores):.4f}")
         print(f"  Idiom-only similarity: Mean={np.mean(idiom_scores):.4f}, Median={np.median(idiom_scores):.4f}")
         print(f"  Context similarity:    Mean={np.mean(context_scores):.4f}, Median={np.median(context_scores):.4f}")
         print(f"  Lexical overlap:       Mean={np.mean(overlaps):.2%}, Median={np.median(overlaps):.2%}")
 
         # High lexical overlap warnings
-        high_overlap = [m for m in all_matches_sorted if m['lexical_overlap'] > 0.4]
+        high_overlap = int(np.count_nonzero(overlaps > 0.4))
         if high_overlap:
-            print(f"\n  ⚠️  {len(high_overlap)} matches have >40% lexical overlap (may be spurious)")
+            print(f"\n  ⚠️  {high_overlap} matches have >40% lexical overlap (may be spurious)")
 
     # Best match statistics
     best_weighted = [m['weighted_similarity'] for m in target_best_matches_sorted]
@@ -299,7 +532,27 @@ def analyze_language_pair(en_idioms, en_embeddings,
         pct = count / len(best_weighted) * 100
         print(f"  >= {thresh:.1f}: {count:4d} ({pct:5.1f}%)")
 
-    return len(all_matches_sorted), target_best_matches_sorted
+    return num_matches, target_best_matches_sorted
+
+
+def run_language_pair(target_pkl_name, lang_name, lang_code):
+    """Worker: load one language pair and run the improved analysis."""
+    emb_dir = Path("data/embeddings")
+
+    print(f"[{lang_code}] Loading dual embeddings...")
+    en_data = load_dual_embeddings(emb_dir / "english_dual_embeddings.pkl")
+    print(f"[{lang_code}] ✓ English: {len(en_data['idioms']):,} idioms")
+
+    target_data = load_dual_embeddings(emb_dir / target_pkl_name)
+    print(f"[{lang_code}] ✓ {lang_name}: {len(target_data['idioms']):,} idioms\n")
+
+    count, _ = analyze_language_pair(
+        en_data['idioms'], en_data,
+        target_data['idioms'], target_data,
+        lang_name, lang_code,
+        min_threshold=0.65
+    )
+    return count
 
 
 def main():
@@ -313,60 +566,24 @@ def main():
     print("  ✓ Higher quality threshold (0.65+)")
     print()
 
-    # Load dual embeddings
-    emb_dir = Path("data/embeddings")
-
-    print("Loading dual embeddings...")
-    en_data = load_dual_embeddings(emb_dir / "english_dual_embeddings.pkl")
-    en_idioms = en_data['idioms']
-    print(f"✓ English: {len(en_idioms):,} idioms")
-
-    fr_data = load_dual_embeddings(emb_dir / "french_dual_embeddings.pkl")
-    fr_idioms = fr_data['idioms']
-    print(f"✓ French: {len(fr_idioms):,} idioms")
+    # Convert the shared English pickle to its .npz/.idioms.json form
+    # before the workers spawn, so none of them repeats the one-time
+    # conversion on a first post-migration run
+    load_dual_embeddings(Path("data/embeddings") / "english_dual_embeddings.pkl")
 
-    fi_data = load_dual_embeddings(emb_dir / "finnish_dual_embeddings.pkl")
-    fi_idioms = fi_data['idioms']
-    print(f"✓ Finnish: {len(fi_idioms):,} idioms")
+    # The three language pairs only share the read-only English
+    # embeddings and write independent output files, so they run in
+    # separate processes
+    jobs = [
+        ("french_dual_embeddings.pkl", "French", "fr"),
+        ("finnish_dual_embeddings.pkl", "Finnish", "fi"),
+        ("japanese_dual_embeddings.pkl", "Japanese", "jp"),
+    ]
 
-    jp_data = load_dual_embeddings(emb_dir / "japanese_dual_embeddings.pkl")
-    jp_idioms = jp_data['idioms']
-    print(f"✓ Japanese: {len(jp_idioms):,} idioms")
-    print()
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        counts = list(pool.map(run_language_pair, *zip(*jobs)))
 
-    # Analyze all language pairs
-    results = {}
-
-    # French
-    fr_count, fr_matches = analyze_language_pair(
-        en_idioms, en_data,
-        fr_idioms, fr_data,
-        "French", "fr",
-        min_threshold=0.65
-    )
-    results['French'] = (fr_count, fr_matches)
-
-    print("\n\n")
-
-    # Finnish
-    fi_count, fi_matches = analyze_language_pair(
-        en_idioms, en_data,
-        fi_idioms, fi_data,
-        "Finnish", "fi",
-        min_threshold=0.65
-    )
-    results['Finnish'] = (fi_count, fi_matches)
-
-    print("\n\n")
-
-    # Japanese
-    jp_count, jp_matches = analyze_language_pair(
-        en_idioms, en_data,
-        jp_idioms, jp_data,
-        "Japanese", "jp",
-        min_threshold=0.65
-    )
-    results['Japanese'] = (jp_count, jp_matches)
+    results = {lang_name: count for (_, lang_name, _), count in zip(jobs, counts)}
 
     # Summary
     print("\n" + "=" * 80)
@@ -374,10 +591,10 @@ def main():
     print("=" * 80)
 
     print("\nMatches above threshold (0.65) by language:")
-    for lang, (count, _) in results.items():
+    for lang, count in results.items():
         print(f"  {lang:10s}: {count:5,} high-quality matches")
 
-    total_matches = sum(count for count, _ in results.values())
+    total_matches = sum(results.values())
     print(f"\nTotal high-quality matches: {total_matches:,}")
 
     print("\nExpected improvement:")
@@ -392,7 +609,7 @@ def main():
 if __name__ == "__main__":
     try:
         results = main()
-        total = sum(count for count, _ in results.values())
+        total = sum(results.values())
         print(f"\n✓ SUCCESS! Generated {total:,} improved cross-lingual matches")
     except Exception as e:
         print(f"\n✗ Error: {e}")
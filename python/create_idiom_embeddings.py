@@ -6,12 +6,18 @@ This script creates embeddings without assuming 1-to-1 matching.
 Instead, it enables exploratory semantic analysis within and across languages.
 """
 import json
-import csv
-import pickle
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+import pandas as pd
+import torch
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
 
 def load_english_idioms(magpie_file):
     """Load English idioms from MAGPIE with contexts."""
@@ -39,19 +45,13 @@ def load_french_idioms(french_file):
     """Load French idioms with contexts."""
     print(f"\nLoading French idioms from: {french_file}")
 
-    french_idioms = []
-
-    with open(french_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            french_contexts = row['french_contexts'].split(' ||| ')
-
-            french_idioms.append({
-                'idiom': row['idiom'],
-                'contexts': french_contexts,
-                'num_contexts': int(row['num_contexts']),
-                'english_translations': row['english_translations'].split(' ||| ')
-            })
+    # pandas' C-level string split replaces the row-by-row DictReader
+    # loop; the per-row Python overhead dominated on large CSVs
+    df = pd.read_csv(french_file)
+    df['contexts'] = df['french_contexts'].str.split(' ||| ', regex=False)
+    df['english_translations'] = df['english_translations'].str.split(' ||| ', regex=False)
+    french_idioms = df[['idiom', 'contexts', 'num_contexts',
+                        'english_translations']].to_dict('records')
 
     print(f"✓ Loaded {len(french_idioms):,} French idioms with contexts")
     return french_idioms
@@ -63,36 +63,119 @@ def create_idiom_representation(idiom, contexts, max_contexts=3):
     return f"{idiom}. " + " ".join(context_sample)
 
 
+def _representation_for_item(item):
+    """Worker for parallel representation building."""
+    return create_idiom_representation(item['idiom'], item['contexts'])
+
+
+def build_representations(idioms):
+    """Build text representations across processes.
+
+    Pure-Python string assembly over tens of thousands of idioms is
+    GIL-bound; the work is stateless, so it fans out across cores with
+    a chunksize large enough to amortize pickling.
+    """
+    with ProcessPoolExecutor() as pool:
+        return list(pool.map(_representation_for_item, idioms, chunksize=1024))
+
+
+def save_embeddings(emb_file, idioms, embeddings):
+    """Save embeddings as a .npy matrix plus a JSON idiom sidecar.
+
+    This is the layout the analysis scripts' loaders prefer: the matrix
+    opens with mmap_mode='r' so only the rows actually touched are paged
+    in, and there is no unpickle step or peak-memory spike.
+    """
+    emb_file = Path(emb_file)
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    np.save(emb_file, embeddings)
+    with open(emb_file.with_suffix('.idioms.json'), 'w', encoding='utf-8') as f:
+        json.dump(idioms, f, ensure_ascii=False)
+    q, scale = quantize_int8(embeddings)
+    np.savez(emb_file.with_suffix('.int8.npz'), q=q, scale=scale)
+
+
+def quantize_int8(embeddings):
+    """Scalar-quantize to int8 with per-vector scales.
+
+    4x less bandwidth than float32 for any consumer, and cosine over
+    normalized vectors is invariant to the per-vector scale, so int8
+    dot-product kernels (SimSIMD VNNI/NEON) can use q directly.
+    """
+    scale = np.abs(embeddings).max(axis=1, keepdims=True) / 127.0
+    scale[scale == 0] = 1.0
+    q = np.round(embeddings / scale).clip(-128, 127).astype(np.int8)
+    return q, scale.astype(np.float32)
+
+
+def encode_texts(model, texts):
+    """Encode texts under inference mode, with fp16 autocast on GPU.
+
+    Normalizing inside encode happens on-device as part of pooling, so
+    downstream cosine similarity reduces to a plain dot product.
+    """
+    autocast = (torch.autocast('cuda', dtype=torch.float16)
+                if torch.cuda.is_available() else nullcontext())
+    with torch.inference_mode(), autocast:
+        return model.encode(texts, batch_size=64, normalize_embeddings=True,
+                            convert_to_numpy=True, show_progress_bar=True)
+
+
 def analyze_within_language_similarity(idioms, embeddings, lang_name, top_k=5):
     """Analyze semantic similarity within a language."""
     print(f"\n{'=' * 80}")
     print(f"WITHIN-{lang_name.upper()} SEMANTIC SIMILARITY")
     print("=" * 80)
 
-    # Compute similarity matrix
-    sim_matrix = cosine_similarity(embeddings)
+    num_queries = min(10, len(idioms))
+
+    if faiss is not None:
+        # Exact top-k inner-product search over normalized vectors for
+        # just the queried rows — the N×N matrix is never materialized
+        normalized = np.ascontiguousarray(embeddings, dtype=np.float32)
+        normalized = normalized / np.linalg.norm(normalized, axis=1, keepdims=True)
+        index = faiss.IndexFlatIP(normalized.shape[1])
+        index.add(normalized)
+        # Retrieve one extra neighbour so the query idiom itself can be
+        # dropped from its own result list
+        top_sims, top_idx = index.search(normalized[:num_queries], top_k + 1)
+    else:
+        # encode() emits L2-normalized vectors, so cosine is a plain dot
+        # product: one sgemm over just the queried rows, with none of
+        # sklearn's copy + renormalize overhead or the full N x N matrix
+        normalized = np.asarray(embeddings, dtype=np.float32)
+        sim_matrix = normalized[:num_queries] @ normalized.T
 
     # For each idiom, find most similar idioms (excluding itself)
     examples = []
 
-    for i in range(min(10, len(idioms))):
-        # Get similarities, excluding self
-        sims = sim_matrix[i].copy()
-        sims[i] = -1  # Exclude self
-
-        # Get top k similar idioms
-        top_indices = np.argsort(sims)[-top_k:][::-1]
+    for i in range(num_queries):
+        if faiss is not None:
+            neighbors = [(int(idx), float(sim))
+                         for idx, sim in zip(top_idx[i], top_sims[i])
+                         if idx != i][:top_k]
+        else:
+            # Get similarities, excluding self (the block is private to
+            # this function, so masking in place needs no copy)
+            sims = sim_matrix[i]
+            sims[i] = -np.inf
+
+            # Top-k via introselect then sort just those k:
+            # O(N + k log k) instead of argsort's O(N log N)
+            top_indices = np.argpartition(sims, -top_k)[-top_k:]
+            top_indices = top_indices[np.argsort(sims[top_indices])[::-1]]
+            neighbors = [(int(idx), float(sims[idx])) for idx in top_indices]
 
         print(f"\n{i+1}. {idioms[i]['idiom']}")
         print(f"   Context: {idioms[i]['contexts'][0][:80]}...")
         print(f"   Most similar {lang_name} idioms:")
 
         similar_idioms = []
-        for rank, idx in enumerate(top_indices, 1):
-            print(f"      {rank}. {idioms[idx]['idiom']:40s} (sim: {sims[idx]:.3f})")
+        for rank, (idx, sim) in enumerate(neighbors, 1):
+            print(f"      {rank}. {idioms[idx]['idiom']:40s} (sim: {sim:.3f})")
             similar_idioms.append({
                 'idiom': idioms[idx]['idiom'],
-                'similarity': float(sims[idx])
+                'similarity': sim
             })
 
         examples.append({
@@ -125,8 +208,13 @@ def main():
     print("=" * 80)
     print("\nModel: paraphrase-multilingual-mpnet-base-v2")
 
-    model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2')
-    print("✓ Model loaded")
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2', device=device)
+    if device == 'cuda':
+        # fp16 weights on tensor cores; similarity rankings are
+        # insensitive at this precision
+        model.half()
+    print(f"✓ Model loaded (device: {device})")
 
     # Create embeddings
     print("\n" + "=" * 80)
@@ -134,24 +222,22 @@ def main():
     print("=" * 80)
 
     print("\nCreating English representations...")
-    english_texts = [create_idiom_representation(item['idiom'], item['contexts'])
-                     for item in english_idioms]
+    english_texts = build_representations(english_idioms)
 
     print(f"Sample English representation:\n  {english_texts[0][:150]}...\n")
 
     print("Encoding English idioms...")
-    english_embeddings = model.encode(english_texts, show_progress_bar=True)
+    english_embeddings = encode_texts(model, english_texts)
     print(f"✓ Encoded {len(english_embeddings):,} English idioms")
     print(f"  Embedding shape: {english_embeddings.shape}")
 
     print("\nCreating French representations...")
-    french_texts = [create_idiom_representation(item['idiom'], item['contexts'])
-                    for item in french_idioms]
+    french_texts = build_representations(french_idioms)
 
     print(f"Sample French representation:\n  {french_texts[0][:150]}...\n")
 
     print("Encoding French idioms...")
-    french_embeddings = model.encode(french_texts, show_progress_bar=True)
+    french_embeddings = encode_texts(model, french_texts)
     print(f"✓ Encoded {len(french_embeddings):,} French idioms")
     print(f"  Embedding shape: {french_embeddings.shape}")
 
@@ -164,23 +250,13 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Save English embeddings
-    en_emb_file = output_dir / "english_idiom_embeddings.pkl"
-    with open(en_emb_file, 'wb') as f:
-        pickle.dump({
-            'idioms': english_idioms,
-            'embeddings': english_embeddings,
-            'texts': english_texts
-        }, f)
+    en_emb_file = output_dir / "english_idiom_embeddings.npy"
+    save_embeddings(en_emb_file, english_idioms, english_embeddings)
     print(f"\n✓ Saved English embeddings to: {en_emb_file}")
 
     # Save French embeddings
-    fr_emb_file = output_dir / "french_idiom_embeddings.pkl"
-    with open(fr_emb_file, 'wb') as f:
-        pickle.dump({
-            'idioms': french_idioms,
-            'embeddings': french_embeddings,
-            'texts': french_texts
-        }, f)
+    fr_emb_file = output_dir / "french_idiom_embeddings.npy"
+    save_embeddings(fr_emb_file, french_idioms, french_embeddings)
     print(f"✓ Saved French embeddings to: {fr_emb_file}")
 
     # Analyze within-language semantic similarity
@@ -3,11 +3,18 @@ Create improved embeddings for more accurate cross-lingual idiom matching.
 Uses dual representation: idiom-only + idiom-with-contexts.
 """
 import json
-import csv
-import pickle
+import hashlib
+from contextlib import nullcontext
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 import numpy as np
+import pandas as pd
+import torch
+
+try:
+    from safetensors.numpy import save_file as safetensors_save
+except ImportError:
+    safetensors_save = None
 
 
 def load_english_idioms(magpie_file):
@@ -36,27 +43,23 @@ def load_target_language_idioms(csv_file, lang_code):
     """Load target language idioms with contexts."""
     print(f"Loading {lang_code.upper()} idioms from: {csv_file}")
 
-    idioms = []
-
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Handle different column naming conventions
-            if f'{lang_code}_contexts' in row:
-                contexts = row[f'{lang_code}_contexts'].split(' ||| ')
-            elif 'french_contexts' in row and lang_code == 'fr':
-                contexts = row['french_contexts'].split(' ||| ')
-            else:
-                # Fallback: find any column with 'context' in name
-                context_col = [col for col in row.keys() if 'context' in col.lower()][0]
-                contexts = row[context_col].split(' ||| ')
-
-            idioms.append({
-                'idiom': row['idiom'],
-                'contexts': contexts,
-                'num_contexts': int(row['num_contexts']),
-                'english_translations': row['english_translations'].split(' ||| ')
-            })
+    # pandas' C-level string split replaces the row-by-row DictReader
+    # loop; the per-row Python overhead dominated on large CSVs
+    df = pd.read_csv(csv_file)
+
+    # Handle different column naming conventions
+    if f'{lang_code}_contexts' in df.columns:
+        context_col = f'{lang_code}_contexts'
+    elif 'french_contexts' in df.columns and lang_code == 'fr':
+        context_col = 'french_contexts'
+    else:
+        # Fallback: find any column with 'context' in name
+        context_col = [col for col in df.columns if 'context' in col.lower()][0]
+
+    df['contexts'] = df[context_col].str.split(' ||| ', regex=False)
+    df['english_translations'] = df['english_translations'].str.split(' ||| ', regex=False)
+    idioms = df[['idiom', 'contexts', 'num_contexts',
+                 'english_translations']].to_dict('records')
 
     print(f"✓ Loaded {len(idioms):,} {lang_code.upper()} idioms with contexts")
     return idioms
@@ -78,8 +81,45 @@ def create_dual_representations(idiom, contexts, max_contexts=3):
     return idiom_only, idiom_with_contexts
 
 
-def create_dual_embeddings_for_language(idioms, lang_name, model):
-    """Create dual embeddings for a language."""
+CACHE_DIR = Path("data/embeddings/cache")
+
+
+def encode_cached(model, texts, cache_tag):
+    """Encode texts, reusing an on-disk cache when the inputs are unchanged.
+
+    The cache key hashes the full text list, so any edit to the source
+    CSVs produces a new key; unchanged reruns skip the transformer
+    forward pass entirely. Arrays are stored as float16 to halve disk
+    I/O and cast back on read.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    key = hashlib.blake2b('\n'.join(texts).encode('utf-8')).hexdigest()[:16]
+    cache_file = CACHE_DIR / f"{cache_tag}_{key}.npy"
+
+    if cache_file.exists():
+        print(f"✓ Loaded cached embeddings: {cache_file.name}")
+        return np.load(cache_file).astype(np.float32)
+
+    # encode() only takes raw strings, so precomputed input_ids can't be
+    # fed back in — instead deduplicate exact texts and tokenize/encode
+    # each unique string once, scattering rows back afterwards
+    unique = {}
+    for text in texts:
+        unique.setdefault(text, len(unique))
+
+    autocast = (torch.autocast('cuda', dtype=torch.float16)
+                if torch.cuda.is_available() else nullcontext())
+    with torch.inference_mode(), autocast:
+        # normalize on-device so downstream cosine is a plain dot product
+        encoded = model.encode(list(unique), batch_size=128, show_progress_bar=True,
+                               convert_to_numpy=True, normalize_embeddings=True)
+    embeddings = np.ascontiguousarray(encoded[[unique[text] for text in texts]])
+    np.save(cache_file, embeddings.astype(np.float16))
+    return embeddings
+
+
+def build_dual_texts(idioms, lang_name):
+    """Build idiom-only and idiom+context text lists for a language."""
     print(f"\nCreating dual {lang_name} representations...")
 
     idiom_only_texts = []
@@ -96,20 +136,42 @@ def create_dual_embeddings_for_language(idioms, lang_name, model):
     print(f"Sample {lang_name} idiom-only: {idiom_only_texts[0]}")
     print(f"Sample {lang_name} with context: {idiom_context_texts[0][:150]}...")
 
-    print(f"\nEncoding {lang_name} idioms (idiom-only)...")
-    idiom_only_embeddings = model.encode(idiom_only_texts, show_progress_bar=True)
-    print(f"✓ Encoded {len(idiom_only_embeddings):,} idiom-only embeddings")
+    return idiom_only_texts, idiom_context_texts
 
-    print(f"Encoding {lang_name} idioms (with contexts)...")
-    idiom_context_embeddings = model.encode(idiom_context_texts, show_progress_bar=True)
-    print(f"✓ Encoded {len(idiom_context_embeddings):,} idiom+context embeddings")
 
-    return {
-        'idiom_only': idiom_only_embeddings,
-        'idiom_context': idiom_context_embeddings,
-        'idiom_only_texts': idiom_only_texts,
-        'idiom_context_texts': idiom_context_texts
-    }
+def encode_all_languages(model, dual_texts):
+    """Encode every language's text lists in a single model.encode call.
+
+    Eight separate encode calls each pad their batches independently, so
+    short idiom-only strings and long idiom+context strings never share
+    a batch with similarly-sized texts. Concatenating everything lets
+    sentence-transformers length-sort the full corpus, cutting padding
+    FLOPs, and the result is sliced back into per-language views.
+    """
+    all_texts = []
+    spans = {}
+    for lang_name, (idiom_only_texts, idiom_context_texts) in dual_texts.items():
+        for kind, texts in (('idiom_only', idiom_only_texts),
+                            ('idiom_context', idiom_context_texts)):
+            spans[(lang_name, kind)] = (len(all_texts), len(all_texts) + len(texts))
+            all_texts.extend(texts)
+
+    print(f"\nEncoding {len(all_texts):,} texts across {len(dual_texts)} languages...")
+    all_embeddings = encode_cached(model, all_texts, "all_dual")
+    print(f"✓ Encoded {len(all_embeddings):,} embeddings")
+
+    embeddings = {}
+    for lang_name, (idiom_only_texts, idiom_context_texts) in dual_texts.items():
+        result = {
+            'idiom_only_texts': idiom_only_texts,
+            'idiom_context_texts': idiom_context_texts
+        }
+        for kind in ('idiom_only', 'idiom_context'):
+            start, end = spans[(lang_name, kind)]
+            result[kind] = all_embeddings[start:end]
+        embeddings[lang_name] = result
+
+    return embeddings
 
 
 def main():
@@ -143,29 +205,31 @@ def main():
     print("=" * 80)
     print("\nModel: paraphrase-multilingual-mpnet-base-v2")
 
-    model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2')
-    print("✓ Model loaded")
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2', device=device)
+    if device == 'cuda':
+        # fp16 weights on tensor cores; similarity rankings are
+        # insensitive at this precision
+        model.half()
+    print(f"✓ Model loaded (device: {device})")
 
     # Create dual embeddings
     print("\n" + "=" * 80)
     print("CREATING DUAL EMBEDDINGS")
     print("=" * 80)
 
-    en_embeddings = create_dual_embeddings_for_language(
-        english_idioms, "English", model
-    )
-
-    fr_embeddings = create_dual_embeddings_for_language(
-        french_idioms, "French", model
-    )
-
-    fi_embeddings = create_dual_embeddings_for_language(
-        finnish_idioms, "Finnish", model
-    )
+    dual_texts = {
+        'English': build_dual_texts(english_idioms, "English"),
+        'French': build_dual_texts(french_idioms, "French"),
+        'Finnish': build_dual_texts(finnish_idioms, "Finnish"),
+        'Japanese': build_dual_texts(japanese_idioms, "Japanese")
+    }
 
-    jp_embeddings = create_dual_embeddings_for_language(
-        japanese_idioms, "Japanese", model
-    )
+    all_embeddings = encode_all_languages(model, dual_texts)
+    en_embeddings = all_embeddings['English']
+    fr_embeddings = all_embeddings['French']
+    fi_embeddings = all_embeddings['Finnish']
+    jp_embeddings = all_embeddings['Japanese']
 
     # Save embeddings
     print("\n" + "=" * 80)
@@ -183,15 +247,23 @@ def main():
     ]
 
     for lang_name, idioms, embeddings in languages:
-        emb_file = output_dir / f"{lang_name}_dual_embeddings.pkl"
-        with open(emb_file, 'wb') as f:
-            pickle.dump({
-                'idioms': idioms,
-                'idiom_only_embeddings': embeddings['idiom_only'],
-                'idiom_context_embeddings': embeddings['idiom_context'],
-                'idiom_only_texts': embeddings['idiom_only_texts'],
-                'idiom_context_texts': embeddings['idiom_context_texts']
-            }, f)
+        # safetensors mmaps zero-copy on load; .npz is the fallback
+        # layout load_dual_embeddings also accepts. Either way: plain
+        # contiguous float32 arrays plus a JSON sidecar, no unpickle pass
+        idiom_only = np.ascontiguousarray(embeddings['idiom_only'], dtype=np.float32)
+        idiom_context = np.ascontiguousarray(embeddings['idiom_context'], dtype=np.float32)
+        if safetensors_save is not None:
+            emb_file = output_dir / f"{lang_name}_dual_embeddings.safetensors"
+            safetensors_save(
+                {'idiom_only': idiom_only, 'idiom_context': idiom_context},
+                str(emb_file)
+            )
+        else:
+            emb_file = output_dir / f"{lang_name}_dual_embeddings.npz"
+            np.savez(emb_file, idiom_only=idiom_only, idiom_context=idiom_context)
+        with open(output_dir / f"{lang_name}_dual_embeddings.idioms.json", 'w',
+                  encoding='utf-8') as f:
+            json.dump(idioms, f, ensure_ascii=False)
         print(f"✓ Saved {lang_name} dual embeddings to: {emb_file}")
 
     # Summary
@@ -4,14 +4,54 @@ Target: 100k-200k sentences for finding idiom contexts.
 """
 import requests
 import random
+import math
+import re
 import sys
 import os
+import io
+import gzip
+import queue
+import threading
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import SPANISH_SUBTITLES
 
+# Matches any Unicode letter ([^\W\d_] = word char minus digits and
+# underscore) in one C-level scan with early exit at the first hit —
+# any(c.isalpha() ...) pays a Python-level call per character instead
+HAS_LETTER = re.compile(r'[^\W\d_]', re.UNICODE).search
+
+
+class QueueReader(io.RawIOBase):
+    """File-like view over byte chunks arriving on a queue.
+
+    A None chunk marks end of stream.
+    """
+
+    def __init__(self, chunk_queue):
+        self.chunk_queue = chunk_queue
+        self.leftover = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        if self.leftover is None:
+            return 0
+        if not self.leftover:
+            chunk = self.chunk_queue.get()
+            if chunk is None:
+                self.leftover = None
+                return 0
+            self.leftover = chunk
+        n = min(len(buf), len(self.leftover))
+        buf[:n] = self.leftover[:n]
+        self.leftover = self.leftover[n:]
+        return n
+
+
 def download_large_spanish_corpus(target_sentences=150000):
     """Download larger Spanish corpus."""
 
@@ -26,9 +66,6 @@ def download_large_spanish_corpus(target_sentences=150000):
     print(f"Target: {target_sentences:,} sentences")
     print("This may take 5-10 minutes...")
 
-    import gzip
-    import io
-
     response = requests.get(url, stream=True, timeout=300)
     response.raise_for_status()
 
@@ -41,47 +78,56 @@ def download_large_spanish_corpus(target_sentences=150000):
 
     print("\nDownloading and processing...")
 
-    # Read compressed data
-    compressed_data = io.BytesIO()
-    downloaded = 0
-
-    for chunk in response.iter_content(chunk_size=8192):
-        if chunk:
-            compressed_data.write(chunk)
-            downloaded += len(chunk)
-            if downloaded % (1024*1024) == 0:
-                print(f"  Downloaded: {downloaded / (1024*1024):.1f} MB", end='\r')
-
-    print(f"\n✓ Downloaded {downloaded / (1024*1024):.1f} MB")
-
-    # Decompress
-    print("\nDecompressing...")
-    compressed_data.seek(0)
-
-    with gzip.GzipFile(fileobj=compressed_data) as f:
-        for i, line in enumerate(f):
-            try:
-                line = line.decode('utf-8').strip()
-
-                # Filter: length > 20 chars, has letters
-                if len(line) > 20 and any(c.isalpha() for c in line):
+    # Producer thread pulls bytes off the socket while this thread
+    # decompresses and filters — wall time becomes max(download,
+    # process) instead of their sum. Socket reads and gzip's C inflate
+    # both release the GIL, so the two threads genuinely overlap, and
+    # the bounded queue applies backpressure so buffered data stays at
+    # queue depth x chunk size.
+    chunk_queue = queue.Queue(maxsize=64)
+
+    def _producer():
+        try:
+            # iter_content never yields empty bytes for a streamed
+            # body, so no per-chunk truthiness guard
+            for chunk in response.iter_content(chunk_size=128 * 1024):
+                chunk_queue.put(chunk)
+        finally:
+            chunk_queue.put(None)
+
+    producer = threading.Thread(target=_producer, daemon=True)
+    producer.start()
+
+    # Vitter's Algorithm L keeps a uniform sample of target_sentences
+    # lines in a single pass — no collect-everything-then-random.sample
+    # second pass, and because the whole corpus is scanned the sample is
+    # uniform over all of it rather than biased to the file's beginning.
+    w = math.exp(math.log(random.random()) / target_sentences)
+    next_pick = target_sentences + int(math.log(random.random()) / math.log(1.0 - w)) + 1
+    kept = 0
+
+    with gzip.GzipFile(fileobj=io.BufferedReader(QueueReader(chunk_queue))) as gz:
+        text = io.TextIOWrapper(gz, encoding='utf-8', errors='ignore')
+        for i, line in enumerate(text):
+            line = line.strip()
+
+            # Filter: length > 20 chars, has letters
+            if len(line) > 20 and HAS_LETTER(line):
+                kept += 1
+                if len(sentences) < target_sentences:
                     sentences.append(line)
+                elif kept == next_pick:
+                    sentences[random.randrange(target_sentences)] = line
+                    w *= math.exp(math.log(random.random()) / target_sentences)
+                    next_pick += int(math.log(random.random()) / math.log(1.0 - w)) + 1
 
-                    if len(sentences) >= target_sentences:
-                        break
-
-                if (i + 1) % 50000 == 0:
-                    print(f"  Processed {i+1:,} lines, kept {len(sentences):,} sentences", end='\r')
-
-            except Exception as e:
-                continue
+            if (i + 1) % 50000 == 0:
+                print(f"  Processed {i+1:,} lines, sampled from {kept:,} sentences", end='\r')
 
-    print(f"\n✓ Collected {len(sentences):,} sentences")
+    producer.join()
+    response.close()
 
-    # Sample if we got more than needed
-    if len(sentences) > target_sentences:
-        print(f"\nRandomly sampling {target_sentences:,} sentences...")
-        sentences = random.sample(sentences, target_sentences)
+    print(f"\n✓ Sampled {len(sentences):,} sentences from {kept:,} candidates")
 
     # Save
     output_file = SPANISH_SUBTITLES / "spanish_opus_large.txt"
@@ -5,7 +5,7 @@ Extracts idioms with their usage examples to preserve semantic meaning.
 import json
 import requests
 from pathlib import Path
-from typing import Set, List, Dict
+from typing import List, Dict
 from collections import defaultdict
 import sys
 import os
@@ -19,6 +19,11 @@ except ImportError:
     # Fallback if running from project root
     from python.config import ENGLISH_IDIOMS_DIR
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def download_magpie_idioms(
     output_format: str = 'json',
@@ -49,23 +54,48 @@ def download_magpie_idioms(
         response = requests.get(url, stream=True)
         response.raise_for_status()
 
-        # Group examples by idiom
-        idiom_contexts: Dict[str, List[Dict]] = defaultdict(list)
-        unique_idioms: Set[str] = set()
+        # Flat append-only records plus an int counter per idiom — the
+        # hot loop avoids allocating a list per idiom, and capped idioms
+        # skip straight past context extraction. Grouping happens once
+        # at write time.
+        counts: Dict[str, int] = {}
+        records: List[tuple] = []
 
         print("Extracting idioms with idiomatic contexts...")
         line_count = 0
         idiomatic_count = 0
 
-        # Process line by line
-        for line in response.iter_lines(decode_unicode=True):
+        # Process line by line. orjson parses the raw UTF-8 bytes in C;
+        # leaving decode_unicode off also skips Python's incremental
+        # per-line decoder (str fields come out decoded either way)
+        loads = orjson.loads if orjson is not None else json.loads
+
+        # Bytes-level prefilter: markers that positively identify a
+        # record the confidence/label filter below would reject anyway,
+        # so the JSON parse — the expensive step — is skipped for them.
+        # Ambiguous lines (different spacing, missing keys) fall through
+        # to the parser, so filtering semantics are unchanged.
+        reject_markers = []
+        if idiomatic_only:
+            for label in ('l', 'o'):
+                reject_markers.append(f'"label": "{label}"'.encode())
+                reject_markers.append(f'"label":"{label}"'.encode())
+        for digit in range(int(min_confidence * 10)):
+            reject_markers.append(f'"confidence": 0.{digit}'.encode())
+            reject_markers.append(f'"confidence":0.{digit}'.encode())
+        reject_markers = tuple(reject_markers)
+
+        for line in response.iter_lines(decode_unicode=False):
             if line:
                 line_count += 1
                 if line_count % 10000 == 0:
-                    print(f"  Processed {line_count} entries, found {len(unique_idioms)} unique idioms ({idiomatic_count} idiomatic uses)")
+                    print(f"  Processed {line_count} entries, found {len(counts)} unique idioms ({idiomatic_count} idiomatic uses)")
+
+                if any(marker in line for marker in reject_markers):
+                    continue
 
                 try:
-                    entry = json.loads(line)
+                    entry = loads(line)
                     idiom = entry.get('idiom', '').strip()
                     label = entry.get('label', '')
                     confidence = entry.get('confidence', 0)
@@ -81,34 +111,40 @@ def download_magpie_idioms(
                     if not idiom:
                         continue
 
-                    # Track unique idioms
-                    unique_idioms.add(idiom)
-
                     # Only add if we haven't reached max examples for this idiom
-                    if len(idiom_contexts[idiom]) < max_examples_per_idiom:
+                    seen = counts.get(idiom, 0)
+                    if seen < max_examples_per_idiom:
+                        counts[idiom] = seen + 1
+
                         # Extract context (the sentence containing the idiom)
                         context = entry.get('context', [])
                         # context[2] is the sentence with the idiom (middle of 5-element array)
                         sentence = context[2] if len(context) > 2 else ' '.join(filter(None, context))
 
-                        idiom_contexts[idiom].append({
+                        records.append((idiom, {
                             'sentence': sentence,
                             'confidence': confidence,
                             'label': label,
                             'genre': entry.get('genre', ''),
-                        })
+                        }))
                         idiomatic_count += 1
 
-                except json.JSONDecodeError:
+                except ValueError:
+                    # covers json.JSONDecodeError and orjson.JSONDecodeError
                     continue
 
         print(f"\nTotal entries processed: {line_count}")
-        print(f"Unique idioms found: {len(unique_idioms)}")
+        print(f"Unique idioms found: {len(counts)}")
         print(f"Total idiomatic examples: {idiomatic_count}")
 
+        # Group examples by idiom, once, now that the hot loop is done
+        idiom_contexts: Dict[str, List[Dict]] = defaultdict(list)
+        for idiom, example in records:
+            idiom_contexts[idiom].append(example)
+
         # Prepare data for export
         idiom_data = []
-        for idiom in sorted(unique_idioms):
+        for idiom in sorted(idiom_contexts):
             contexts = idiom_contexts[idiom]
             idiom_data.append({
                 'idiom': idiom,
@@ -13,8 +13,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 try:
     from config import SPANISH_SUBTITLES
+    from data_processing.http_session import SESSION
 except ImportError:
     from python.config import SPANISH_SUBTITLES
+    from python.data_processing.http_session import SESSION
 
 
 def download_partial_opus_spanish(chunk_size_mb: int = 5, target_lines: int = 10000):
@@ -39,7 +41,7 @@ def download_partial_opus_spanish(chunk_size_mb: int = 5, target_lines: int = 10
         headers = {'Range': f'bytes=0-{chunk_size_bytes-1}'}
 
         print(f"\nRequesting first {chunk_size_mb}MB...")
-        response = requests.get(url, headers=headers, stream=True, timeout=60)
+        response = SESSION.get(url, headers=headers, stream=True, timeout=60)
 
         if response.status_code not in [200, 206]:  # 206 = Partial Content
             print(f"Error: Server returned status {response.status_code}")
@@ -47,44 +49,33 @@ def download_partial_opus_spanish(chunk_size_mb: int = 5, target_lines: int = 10
 
         print("✓ Download started")
 
-        # Download the chunk
-        compressed_data = b""
-        downloaded = 0
-
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                compressed_data += chunk
-                downloaded += len(chunk)
-                if downloaded % (512 * 1024) == 0:  # Every 512KB
-                    print(f"  Downloaded: {downloaded / (1024 * 1024):.1f} MB", end='\r')
-
-        print(f"\n✓ Downloaded {downloaded / (1024 * 1024):.2f} MB (compressed)")
-
-        # Decompress the data
-        print("\nDecompressing...")
-        try:
-            decompressed = gzip.decompress(compressed_data)
-            print(f"✓ Decompressed to {len(decompressed) / (1024 * 1024):.2f} MB")
-        except Exception as e:
-            # Partial gzip might not decompress perfectly, try to salvage what we can
-            print(f"Partial decompression (expected with chunked download)")
-            try:
-                # Try decompressing with error tolerance
-                decompressor = gzip.GzipFile(fileobj=io.BytesIO(compressed_data))
-                decompressed = decompressor.read()
-            except:
-                print("Could not decompress. Trying alternative approach...")
-                return 0
-
-        # Extract lines
+        # Stream-decompress straight off the socket: gzip inflates while
+        # bytes are still arriving, nothing is buffered in RAM, and the
+        # loop stops — download included — as soon as target_lines
+        # non-empty lines are in hand
         print(f"\nExtracting up to {target_lines:,} lines...")
-        text = decompressed.decode('utf-8', errors='ignore')
-        lines = text.split('\n')
+        response.raw.decode_content = False
+        selected_lines = []
 
-        print(f"✓ Found {len(lines):,} lines in chunk")
-
-        # Take only what we need
-        selected_lines = [line.strip() for line in lines[:target_lines] if line.strip()]
+        try:
+            gz = gzip.GzipFile(fileobj=response.raw)
+            text = io.TextIOWrapper(gz, encoding='utf-8', errors='ignore')
+            for line in text:
+                line = line.strip()
+                if line:
+                    selected_lines.append(line)
+                    if len(selected_lines) >= target_lines:
+                        break
+        except (EOFError, OSError):
+            # The Range request truncates the gzip stream mid-block;
+            # everything decoded before the cut is kept
+            print("Partial decompression (expected with chunked download)")
+
+        response.close()
+
+        if not selected_lines:
+            print("Could not decompress. Trying alternative approach...")
+            return 0
 
         print(f"✓ Selected {len(selected_lines):,} non-empty lines")
 
@@ -92,8 +83,11 @@ def download_partial_opus_spanish(chunk_size_mb: int = 5, target_lines: int = 10
         SPANISH_SUBTITLES.mkdir(parents=True, exist_ok=True)
         output_file = SPANISH_SUBTITLES / "spanish_opus_sample.txt"
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(selected_lines))
+        # writelines over a generator streams into the write buffer;
+        # '\n'.join would first allocate one string the size of the
+        # whole output
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(f"{line}\n" for line in selected_lines)
 
         file_size = output_file.stat().st_size
         print(f"\n✓ Saved to: {output_file}")
@@ -3,10 +3,11 @@ Download RANDOM samples of Spanish subtitles from OPUS.
 Strategy: Download a moderate chunk, then randomly sample lines for diversity.
 """
 import requests
-import gzip
+import zlib
 import os
 import sys
 import random
+import time
 from pathlib import Path
 import io
 
@@ -14,8 +15,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 try:
     from config import SPANISH_SUBTITLES
+    from data_processing.http_session import SESSION
 except ImportError:
     from python.config import SPANISH_SUBTITLES
+    from python.data_processing.http_session import SESSION
 
 
 def download_random_spanish_sample(
@@ -54,59 +57,104 @@ def download_random_spanish_sample(
         headers = {'Range': f'bytes={start_byte}-{end_byte}'}
 
         print("Downloading...")
-        response = requests.get(url, headers=headers, stream=True, timeout=120)
+        response = SESSION.get(url, headers=headers, stream=True, timeout=120)
 
         if response.status_code not in [200, 206]:
             print(f"Error: Server returned status {response.status_code}")
             return 0
 
-        # Download the chunk
-        compressed_data = b""
+        # Decompress incrementally while downloading. gzip.decompress
+        # of a Range chunk throws away everything when the cut lands
+        # mid-DEFLATE-block; a decompressobj keeps all output produced
+        # before the truncation point, and restarting on unused_data
+        # handles multi-member gzip streams correctly
+        dec = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        out = io.BytesIO()
         downloaded = 0
-
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                compressed_data += chunk
-                downloaded += len(chunk)
-                if downloaded % (1024 * 1024) == 0:  # Every 1MB
-                    print(f"  Downloaded: {downloaded / (1024 * 1024):.1f} MB", end='\r')
-
+        truncated = False
+        last_report = time.monotonic()
+
+        # iter_content never yields empty bytes for a streamed body, so
+        # there is no per-chunk truthiness guard; 128 KB chunks mean
+        # ~16x fewer Python-level iterations than the old 8 KB
+        for chunk in response.iter_content(chunk_size=128 * 1024):
+            downloaded += len(chunk)
+            try:
+                out.write(dec.decompress(chunk))
+            except zlib.error:
+                truncated = True
+                break
+            while dec.unused_data and not truncated:
+                # A member ended mid-chunk; a fresh decompressor
+                # picks up the next member from the leftover bytes
+                tail = dec.unused_data
+                dec = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                try:
+                    out.write(dec.decompress(tail))
+                except zlib.error:
+                    truncated = True
+            if truncated:
+                break
+            # Time-gated progress: the old modulo check only fired
+            # when the running total landed on an exact MB boundary,
+            # which small chunks almost never hit
+            now = time.monotonic()
+            if now - last_report > 0.25:
+                print(f"  Downloaded: {downloaded / (1024 * 1024):.1f} MB", end='\r')
+                last_report = now
+
+        response.close()
+        decompressed = out.getvalue()
         print(f"\n✓ Downloaded {downloaded / (1024 * 1024):.2f} MB (compressed)")
 
-        # Decompress
-        print("\nDecompressing...")
-        try:
-            decompressed = gzip.decompress(compressed_data)
-            print(f"✓ Decompressed to {len(decompressed) / (1024 * 1024):.2f} MB")
+        if truncated:
+            print("  (Chunk ends mid-block — keeping everything decoded before the cut)")
 
-        except Exception as e:
-            print(f"Decompression failed: {e}")
-            print("The downloaded chunk may not be a complete gzip block.")
+        if not decompressed:
+            print("Decompression produced no data.")
+            print("The downloaded chunk may not start with a valid gzip header.")
             return 0
 
-        # Extract and clean lines
+        print(f"✓ Decompressed to {len(decompressed) / (1024 * 1024):.2f} MB")
+
+        # Extract and sample in one pass
         print("\nExtracting lines...")
         text = decompressed.decode('utf-8', errors='ignore')
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-
-        print(f"✓ Found {len(lines):,} non-empty lines in chunk")
-
-        # Randomly sample
-        if len(lines) <= sample_size:
-            print(f"  (Keeping all {len(lines):,} lines)")
-            selected_lines = lines
-        else:
-            print(f"  Randomly sampling {sample_size:,} lines...")
-            selected_lines = random.sample(lines, sample_size)
 
+        # Algorithm R reservoir sampling over the lazy line iterator:
+        # line i replaces a random reservoir slot with probability
+        # sample_size/i, which is exactly random.sample's distribution —
+        # but only sample_size lines are ever held instead of the whole
+        # pool (strip once per line; split('\n') would materialize a
+        # second full list besides)
+        selected_lines = []
+        total = 0
+        for line in io.StringIO(text):
+            line = line.strip()
+            if not line:
+                continue
+            total += 1
+            if len(selected_lines) < sample_size:
+                selected_lines.append(line)
+            else:
+                j = random.randint(0, total - 1)
+                if j < sample_size:
+                    selected_lines[j] = line
+
+        print(f"✓ Found {total:,} non-empty lines in chunk")
+        if total <= sample_size:
+            print(f"  (Keeping all {total:,} lines)")
         print(f"✓ Sampled {len(selected_lines):,} lines")
 
         # Save to file
         SPANISH_SUBTITLES.mkdir(parents=True, exist_ok=True)
         output_file = SPANISH_SUBTITLES / "spanish_opus_random_sample.txt"
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(selected_lines))
+        # writelines over a generator streams into the write buffer;
+        # '\n'.join would first allocate one string the size of the
+        # whole output
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(f"{line}\n" for line in selected_lines)
 
         file_size = output_file.stat().st_size
         print(f"\n✓ Saved to: {output_file}")
@@ -4,6 +4,7 @@ Strategic approach: Download just enough to test MWE extraction without overwhel
 """
 import requests
 import gzip
+import io
 import os
 import sys
 from pathlib import Path
@@ -13,8 +14,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 try:
     from config import SPANISH_SUBTITLES
+    from data_processing.http_session import SESSION
 except ImportError:
     from python.config import SPANISH_SUBTITLES
+    from python.data_processing.http_session import SESSION
 
 
 def download_opus_spanish_sample(max_files: int = 100, max_size_mb: int = 10):
@@ -43,7 +46,7 @@ def download_opus_spanish_sample(max_files: int = 100, max_size_mb: int = 10):
     print(f"URL: {spanish_url}")
 
     try:
-        response = requests.get(spanish_url, stream=True, timeout=60)
+        response = SESSION.get(spanish_url, stream=True, timeout=60)
         response.raise_for_status()
 
         # Check file size
@@ -55,22 +58,13 @@ def download_opus_spanish_sample(max_files: int = 100, max_size_mb: int = 10):
         if size_mb > max_size_mb * 2:  # Compressed is usually smaller
             print(f"Warning: File is larger than expected. Proceeding with download...")
 
-        # Download to temp location
-        temp_file = "/tmp/spanish_subtitles.txt.gz"
+        # Decompress straight off the socket: lines come out while bytes
+        # are still arriving, and nothing is written to disk twice. The
+        # old flow saved the whole .gz to /tmp and re-read it — double
+        # the disk traffic plus a hardcoded temp path
+        print(f"Downloading and sampling {max_files} files...")
+        response.raw.decode_content = False
 
-        print("Downloading...")
-        with open(temp_file, 'wb') as f:
-            downloaded = 0
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if downloaded % (1024 * 1024) == 0:  # Every MB
-                        print(f"  Downloaded: {downloaded / (1024 * 1024):.1f} MB")
-
-        print(f"\nExtracting and sampling {max_files} files...")
-
-        # Extract and sample lines
         SPANISH_SUBTITLES.mkdir(parents=True, exist_ok=True)
 
         file_count = 0
@@ -78,40 +72,44 @@ def download_opus_spanish_sample(max_files: int = 100, max_size_mb: int = 10):
         lines_per_file = 100  # Approximate lines per subtitle file
         total_size = 0
 
-        with gzip.open(temp_file, 'rt', encoding='utf-8') as f:
-            for i, line in enumerate(f):
-                line = line.strip()
-                if not line:
-                    continue
+        gz = gzip.GzipFile(fileobj=response.raw)
+        reader = io.TextIOWrapper(gz, encoding='utf-8', errors='ignore')
+        for line in reader:
+            line = line.strip()
+            if not line:
+                continue
 
-                line_buffer.append(line)
+            line_buffer.append(line)
 
-                # Create a file every N lines
-                if len(line_buffer) >= lines_per_file:
-                    if file_count >= max_files:
-                        break
+            # Create a file every N lines
+            if len(line_buffer) >= lines_per_file:
+                if file_count >= max_files:
+                    break
 
-                    # Save as subtitle file
-                    output_file = SPANISH_SUBTITLES / f"spanish_sample_{file_count:04d}.txt"
-                    with open(output_file, 'w', encoding='utf-8') as out:
-                        out.write('\n'.join(line_buffer))
+                # Save as subtitle file. writelines streams each line
+                # into the write buffer; '\n'.join first built one
+                # string the size of the whole file
+                output_file = SPANISH_SUBTITLES / f"spanish_sample_{file_count:04d}.txt"
+                with open(output_file, 'w', encoding='utf-8') as out:
+                    out.writelines(f"{l}\n" for l in line_buffer)
 
-                    file_size = output_file.stat().st_size
-                    total_size += file_size
+                # Size is already known from the buffer (length plus
+                # newline per line) — no stat() syscall per file
+                total_size += sum(len(l) + 1 for l in line_buffer)
 
-                    # Check size limit
-                    if total_size > max_size_mb * 1024 * 1024:
-                        print(f"Reached size limit ({max_size_mb}MB), stopping...")
-                        break
+                # Check size limit
+                if total_size > max_size_mb * 1024 * 1024:
+                    print(f"Reached size limit ({max_size_mb}MB), stopping...")
+                    break
 
-                    file_count += 1
-                    line_buffer = []
+                file_count += 1
+                line_buffer = []
 
-                    if file_count % 10 == 0:
-                        print(f"  Created {file_count} files ({total_size / (1024 * 1024):.2f} MB)")
+                if file_count % 10 == 0:
+                    print(f"  Created {file_count} files ({total_size / (1024 * 1024):.2f} MB)")
 
-        # Clean up
-        os.remove(temp_file)
+        # Stopping early leaves the rest of the corpus undownloaded
+        response.close()
 
         print(f"\n✓ Downloaded {file_count} Spanish subtitle samples")
         print(f"  Total size: {total_size / (1024 * 1024):.2f} MB")
@@ -0,0 +1,26 @@
+"""
+Shared HTTP session for the corpus downloaders.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One keep-alive session shared by every downloader: TCP + TLS is
+# negotiated once per host instead of once per call, and transient
+# server errors retry with backoff instead of failing the run.
+#
+# Accept-Encoding: identity matters for the Range requests — if a
+# server or proxy re-gzips the already-gzipped payload, byte offsets
+# no longer line up with the file on disk and partial downloads decode
+# to garbage.
+_adapter = HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=[500, 502, 503, 504]),
+)
+
+SESSION = requests.Session()
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+SESSION.headers['Accept-Encoding'] = 'identity'
@@ -3,10 +3,25 @@ Load and process English idiom corpus.
 """
 import json
 import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses several times faster than stdlib json on the MAGPIE
+# sized corpora; both accept the raw bytes, so the fallback is free
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Compiled once: normalize_idiom runs per idiom in tight corpus loops,
+# and re.sub's per-call cache lookup adds up there
+_WS_RE = re.compile(r'\s+')
+
 
 class IdiomLoader:
     """Load English idioms from various file formats."""
@@ -21,13 +36,19 @@ class IdiomLoader:
             delimiter: Delimiter between idioms (default: newline)
 
         Returns:
-            List of idioms
+            List of normalized idioms
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = file_path.read_text(encoding='utf-8')
 
-        idioms = [idiom.strip() for idiom in content.split(delimiter) if idiom.strip()]
-        return idioms
+        if delimiter == '\n':
+            # splitlines splits \n, \r\n and \r in one C pass; idiom
+            # lists are small enough to read whole
+            parts = content.splitlines()
+        else:
+            parts = content.split(delimiter)
+
+        return [t for part in parts
+                if (t := IdiomLoader.normalize_idiom(part))]
 
     @staticmethod
     def load_from_json(file_path: Path, idiom_key: str = 'idiom') -> List[Dict]:
@@ -41,8 +62,8 @@ class IdiomLoader:
         Returns:
             List of idiom dictionaries
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = _json_loads(f.read())
 
         if isinstance(data, list):
             return data
@@ -83,16 +104,11 @@ class IdiomLoader:
         Returns:
             Normalized idiom
         """
-        # Remove extra whitespace
-        idiom = re.sub(r'\s+', ' ', idiom)
-
-        # Remove leading/trailing whitespace
-        idiom = idiom.strip()
-
+        # Collapse runs of whitespace, then trim the ends
         # Optionally lowercase (for comparison, but keep original for display)
         # idiom = idiom.lower()
 
-        return idiom
+        return _WS_RE.sub(' ', idiom).strip()
 
     @staticmethod
     def load_idiom_corpus(directory: Path, include_contexts: bool = True) -> List[Dict]:
@@ -108,69 +124,140 @@ class IdiomLoader:
         """
         idioms = []
 
-        # Process TXT files
-        for txt_file in directory.glob("*.txt"):
-            # Skip if it's a context file (handled separately)
-            if 'context' in txt_file.name.lower():
-                continue
-
-            txt_idioms = IdiomLoader.load_from_txt(txt_file)
-            for idiom in txt_idioms:
-                idioms.append({
-                    "text": IdiomLoader.normalize_idiom(idiom),
-                    "source": txt_file.name
-                })
-
-        # Process JSON files
-        for json_file in directory.glob("*.json"):
-            json_idioms = IdiomLoader.load_from_json(json_file)
-            for item in json_idioms:
-                idiom_text = item.get('idiom') or item.get('text') or item.get('phrase')
-                if idiom_text:
-                    idiom_entry = {
-                        "text": IdiomLoader.normalize_idiom(idiom_text),
-                        "meaning": item.get('meaning', ''),
-                        "source": json_file.name
-                    }
+        # One directory read: the three .glob calls each re-listed the
+        # whole directory and rebuilt Path objects for every entry
+        txt_files = []
+        json_files = []
+        csv_files = []
+
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                # Lowercase once per entry — the suffix tests and the
+                # context-file exclusion share the one allocation, and
+                # uppercase extensions (.TXT from exports) match too
+                lname = entry.name.lower()
+                if lname.endswith('.txt'):
+                    # Skip if it's a context file (handled separately)
+                    if 'context' in lname:
+                        continue
+                    txt_files.append(Path(entry.path))
+                elif lname.endswith('.json'):
+                    json_files.append(Path(entry.path))
+                elif lname.endswith('.csv'):
+                    csv_files.append(Path(entry.path))
+
+        # Files parse independently, and the heavy part — file I/O plus
+        # C-level JSON/CSV decoding — releases the GIL, so threads
+        # overlap cleanly. map keeps results in submission order
+        tasks = [(IdiomLoader._parse_txt_file, (path,)) for path in txt_files]
+        tasks += [(IdiomLoader._parse_json_file, (path, include_contexts))
+                  for path in json_files]
+        tasks += [(IdiomLoader._parse_csv_file, (path, include_contexts))
+                  for path in csv_files]
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            for file_idioms in pool.map(lambda task: task[0](*task[1]), tasks):
+                idioms.extend(file_idioms)
 
-                    # Handle MAGPIE format with contextual examples
-                    if 'examples' in item and include_contexts:
-                        idiom_entry['examples'] = item['examples']
-                        idiom_entry['contexts'] = [ex.get('sentence', '') for ex in item['examples']]
-                    elif 'example' in item:
-                        idiom_entry['example'] = item.get('example', '')
+        print(f"Loaded {len(idioms)} idioms from {directory}")
+        return idioms
 
-                    idioms.append(idiom_entry)
+    @staticmethod
+    def _parse_txt_file(txt_file: Path) -> List[Dict]:
+        """Parse one idiom text file into corpus entries."""
+        # load_from_txt already normalizes each entry
+        return [{"text": idiom, "source": txt_file.name}
+                for idiom in IdiomLoader.load_from_txt(txt_file)]
 
-        # Process CSV files
-        for csv_file in directory.glob("*.csv"):
-            csv_idioms = IdiomLoader.load_from_csv(csv_file)
+    @staticmethod
+    def _parse_json_file(json_file: Path, include_contexts: bool) -> List[Dict]:
+        """Parse one idiom JSON file into corpus entries."""
+        json_idioms = IdiomLoader.load_from_json(json_file)
+
+        # Resolve the idiom key once per file; rows within a file
+        # share a schema, so the per-row .get() or-chain is probing
+        # the same keys over and over
+        idiom_field = None
+        if json_idioms and isinstance(json_idioms[0], dict):
+            idiom_field = next((k for k in ('idiom', 'text', 'phrase')
+                                if k in json_idioms[0]), None)
 
-            # Group by idiom if multiple examples exist (for context-based CSVs)
-            idiom_dict = {}
-            for item in csv_idioms:
+        idioms = []
+        for item in json_idioms:
+            if idiom_field is not None:
+                idiom_text = item.get(idiom_field)
+            else:
                 idiom_text = item.get('idiom') or item.get('text') or item.get('phrase')
-                if idiom_text:
-                    normalized = IdiomLoader.normalize_idiom(idiom_text)
+            if idiom_text:
+                idiom_entry = {
+                    "text": IdiomLoader.normalize_idiom(idiom_text),
+                    "meaning": item.get('meaning', ''),
+                    "source": json_file.name
+                }
+
+                # Handle MAGPIE format with contextual examples
+                if 'examples' in item and include_contexts:
+                    idiom_entry['examples'] = item['examples']
+                    idiom_entry['contexts'] = [ex.get('sentence', '') for ex in item['examples']]
+                elif 'example' in item:
+                    idiom_entry['example'] = item.get('example', '')
+
+                idioms.append(idiom_entry)
 
-                    if normalized not in idiom_dict:
-                        idiom_dict[normalized] = {
-                            "text": normalized,
-                            "meaning": item.get('meaning', ''),
-                            "source": csv_file.name,
-                            "contexts": []
-                        }
+        return idioms
 
-                    # Add context if available
-                    if 'sentence' in item and include_contexts:
-                        idiom_dict[normalized]['contexts'].append(item['sentence'])
-                    elif 'example' in item:
-                        idiom_dict[normalized]['example'] = item.get('example', '')
+    @staticmethod
+    def _parse_csv_file(csv_file: Path, include_contexts: bool) -> List[Dict]:
+        """Parse one idiom CSV file into corpus entries grouped by idiom."""
+        # csv.reader with precomputed column indices: DictReader
+        # allocates and key-fills a dict per row, which dominates
+        # on context CSVs with hundreds of thousands of rows
+        idiom_dict = {}
+
+        with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return []
+
+            col = {name: i for i, name in enumerate(header)}
+            idiom_idx = next((col[k] for k in ('idiom', 'text', 'phrase')
+                              if k in col), None)
+            if idiom_idx is None:
+                return []
+            meaning_idx = col.get('meaning')
+            sentence_idx = col.get('sentence')
+            example_idx = col.get('example')
 
-            idioms.extend(idiom_dict.values())
+            # Group by idiom if multiple examples exist (for context-based CSVs)
+            for row in reader:
+                idiom_text = row[idiom_idx] if idiom_idx < len(row) else None
+                if not idiom_text:
+                    continue
+
+                normalized = IdiomLoader.normalize_idiom(idiom_text)
+                entry = idiom_dict.get(normalized)
+                if entry is None:
+                    meaning = (row[meaning_idx]
+                               if meaning_idx is not None and meaning_idx < len(row)
+                               else '')
+                    entry = idiom_dict[normalized] = {
+                        "text": normalized,
+                        "meaning": meaning,
+                        "source": csv_file.name,
+                        "contexts": []
+                    }
 
-        print(f"Loaded {len(idioms)} idioms from {directory}")
-        return idioms
+                # Add context if available
+                if sentence_idx is not None and include_contexts:
+                    if sentence_idx < len(row):
+                        entry['contexts'].append(row[sentence_idx])
+                elif example_idx is not None and example_idx < len(row):
+                    entry['example'] = row[example_idx]
+
+        return list(idiom_dict.values())
 
 
 # Example data sources for English idioms (to add to README)
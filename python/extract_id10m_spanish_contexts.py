@@ -3,71 +3,82 @@ Extract Spanish idioms with contexts from ID10M dataset.
 Then match with Gavilán idioms to create a symmetric dataset.
 """
 import csv
+import re
 from pathlib import Path
 from collections import defaultdict
 
+import pandas as pd
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# An idiom span is a B tag plus its run of I tags
+_BIO_SPAN_RE = re.compile(r'BI*')
+
 def parse_bio_file(bio_file):
-    """Parse BIO format file and extract sentences with idioms."""
-    sentences_with_idioms = []
+    """Parse BIO format file, yielding sentences that contain idioms.
+
+    Generator: million-line BIO files never materialize a list of
+    sentence dicts, and sentences without a B- tag cost one boolean
+    check instead of a full tag rescan.
+    """
     current_sentence = []
     current_tags = []
-    current_idiom_tokens = []
-    in_idiom = False
+    has_b = False
 
     with open(bio_file, 'r', encoding='utf-8') as f:
         for line in f:
             line = line.strip()
 
             if not line:  # Empty line = end of sentence
-                if current_sentence and any(tag.startswith('B-') for tag in current_tags):
+                if has_b:
                     # This sentence has idioms
                     sentence_text = ' '.join(current_sentence)
 
-                    # Extract idioms from this sentence
-                    idioms_in_sent = []
-                    idiom_tokens = []
-
-                    for i, (token, tag) in enumerate(zip(current_sentence, current_tags)):
-                        if tag == 'B-IDIOM':
-                            if idiom_tokens:  # Save previous idiom
-                                idioms_in_sent.append(' '.join(idiom_tokens))
-                            idiom_tokens = [token]
-                        elif tag == 'I-IDIOM' and idiom_tokens:
-                            idiom_tokens.append(token)
-                        elif tag == 'O' and idiom_tokens:
-                            idioms_in_sent.append(' '.join(idiom_tokens))
-                            idiom_tokens = []
-
-                    if idiom_tokens:  # Don't forget last idiom
-                        idioms_in_sent.append(' '.join(idiom_tokens))
-
-                    sentences_with_idioms.append({
+                    # Encode each tag as one char and let the regex
+                    # engine locate the B I* runs in C — no Python
+                    # branch per token
+                    compact = ''.join(
+                        'B' if t == 'B-IDIOM' else 'I' if t == 'I-IDIOM' else 'O'
+                        for t in current_tags)
+                    idioms_in_sent = [
+                        ' '.join(current_sentence[m.start():m.end()])
+                        for m in _BIO_SPAN_RE.finditer(compact)]
+
+                    yield {
                         'sentence': sentence_text,
                         'idioms': idioms_in_sent
-                    })
+                    }
 
                 # Reset for next sentence
-                current_sentence = []
-                current_tags = []
+                current_sentence.clear()
+                current_tags.clear()
+                has_b = False
             else:
-                parts = line.split('\t')
-                if len(parts) == 2:
-                    token, tag = parts
+                token, sep, tag = line.partition('\t')
+                if sep:
                     current_sentence.append(token)
                     current_tags.append(tag)
-
-    return sentences_with_idioms
+                    # Matches the span regex exactly, so a guarded
+                    # sentence always yields at least one idiom and the
+                    # sentence join is never wasted
+                    if tag == 'B-IDIOM':
+                        has_b = True
 
 def group_by_idiom(sentences_with_idioms):
-    """Group sentences by idiom."""
+    """Group sentences by idiom, consuming the parse stream directly."""
     idiom_contexts = defaultdict(list)
+    num_sentences = 0
 
     for item in sentences_with_idioms:
+        num_sentences += 1
         sentence = item['sentence']
         for idiom in item['idioms']:
             idiom_contexts[idiom].append(sentence)
 
-    return idiom_contexts
+    return idiom_contexts, num_sentences
 
 def main():
     print("="*80)
@@ -78,12 +89,10 @@ def main():
     bio_file = Path("/Users/avani/Desktop/idiom-proj/data/raw/data/raw/data/raw/id10m_spanish/train_spanish.tsv")
     print(f"\nParsing BIO file: {bio_file}")
 
-    sentences = parse_bio_file(bio_file)
-    print(f"✓ Found {len(sentences)} sentences with idioms")
-
-    # Group by idiom
+    # Group by idiom while streaming sentences out of the parser
     print("\nGrouping sentences by idiom...")
-    idiom_contexts = group_by_idiom(sentences)
+    idiom_contexts, num_sentences = group_by_idiom(parse_bio_file(bio_file))
+    print(f"✓ Found {num_sentences} sentences with idioms")
     print(f"✓ Found {len(idiom_contexts)} unique idioms")
 
     # Show top idioms
@@ -123,28 +132,79 @@ def main():
     gavilan_file = Path("/Users/avani/Desktop/idiom-proj/data/raw/english_idioms/spanish_idioms_gavilan2021.csv")
     print(f"\nLoading Gavilán idioms from: {gavilan_file}")
 
-    gavilan_idioms = {}
-    with open(gavilan_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            gavilan_idioms[row['idiom']] = row
-
-    print(f"✓ Loaded {len(gavilan_idioms)} Gavilán idioms")
+    # usecols parses only the three columns the matcher reads, in C,
+    # instead of a DictReader dict per row keeping every field.
+    # keep_default_na and drop_duplicates preserve the old DictReader
+    # dict semantics: empty meaning cells stay '' rather than becoming
+    # NaN (which csv.writer would emit as the string "nan"), and a
+    # duplicated idiom keeps its last row instead of making the index
+    # non-unique (where .at returns a Series, not a scalar)
+    gav_df = pd.read_csv(
+        gavilan_file,
+        usecols=['idiom', 'idiomatic_meaning', 'idiomatic_meaning_translation'],
+        keep_default_na=False
+    ).drop_duplicates(subset='idiom', keep='last').set_index('idiom')
+
+    print(f"✓ Loaded {len(gav_df)} Gavilán idioms")
 
     # Find matches
     matches = []
     partial_matches = []
 
-    for gavilan_idiom in gavilan_idioms.keys():
-        # Exact match
-        if gavilan_idiom in idiom_contexts:
-            matches.append((gavilan_idiom, idiom_contexts[gavilan_idiom]))
-        else:
-            # Partial match - check if Gavilán idiom is substring or vice versa
-            for id10m_idiom, contexts in idiom_contexts.items():
-                if gavilan_idiom.lower() in id10m_idiom.lower() or id10m_idiom.lower() in gavilan_idiom.lower():
-                    partial_matches.append((gavilan_idiom, id10m_idiom, contexts))
-                    break
+    if ahocorasick is not None:
+        # Two automata turn the all-pairs substring sweep into linear
+        # scans: one over ID10M keys finds Gavilán idioms contained in
+        # them, the other over Gavilán keys finds ID10M idioms they
+        # contain. O(N+M+hits) instead of O(N*M) comparisons
+        unmatched = [g for g in gav_df.index if g not in idiom_contexts]
+
+        id10m_auto = ahocorasick.Automaton()
+        for id10m_idiom in idiom_contexts:
+            id10m_auto.add_word(id10m_idiom.lower(), id10m_idiom)
+        id10m_auto.make_automaton()
+
+        gav_containing = {}  # Gavilán idiom -> ID10M idiom that contains it
+        if unmatched:
+            gav_auto = ahocorasick.Automaton()
+            for gavilan_idiom in unmatched:
+                gav_auto.add_word(gavilan_idiom.lower(), gavilan_idiom)
+            gav_auto.make_automaton()
+
+            for id10m_idiom in idiom_contexts:
+                for _, gavilan_idiom in gav_auto.iter(id10m_idiom.lower()):
+                    gav_containing.setdefault(gavilan_idiom, id10m_idiom)
+
+        for gavilan_idiom in gav_df.index:
+            # Exact match
+            if gavilan_idiom in idiom_contexts:
+                matches.append((gavilan_idiom, idiom_contexts[gavilan_idiom]))
+                continue
+
+            # Partial match - Gavilán idiom inside an ID10M idiom, or
+            # an ID10M idiom inside the Gavilán idiom
+            id10m_idiom = gav_containing.get(gavilan_idiom)
+            if id10m_idiom is None:
+                hit = next(id10m_auto.iter(gavilan_idiom.lower()), None)
+                if hit is not None:
+                    id10m_idiom = hit[1]
+            if id10m_idiom is not None:
+                partial_matches.append((gavilan_idiom, id10m_idiom, idiom_contexts[id10m_idiom]))
+    else:
+        # Lowercase each ID10M key once — the nested loop re-lowered
+        # both sides of every pairing, twice per comparison
+        id10m_lower = {k: k.lower() for k in idiom_contexts}
+
+        for gavilan_idiom in gav_df.index:
+            # Exact match
+            if gavilan_idiom in idiom_contexts:
+                matches.append((gavilan_idiom, idiom_contexts[gavilan_idiom]))
+            else:
+                # Partial match - check if Gavilán idiom is substring or vice versa
+                gl = gavilan_idiom.lower()
+                for id10m_idiom, il in id10m_lower.items():
+                    if gl in il or il in gl:
+                        partial_matches.append((gavilan_idiom, id10m_idiom, idiom_contexts[id10m_idiom]))
+                        break
 
     print(f"\n✓ Exact matches: {len(matches)}")
     print(f"✓ Partial matches: {len(partial_matches)}")
@@ -163,7 +223,6 @@ def main():
 
         # Write exact matches
         for gavilan_idiom, contexts in matches:
-            gav_data = gavilan_idioms[gavilan_idiom]
             contexts_str = ' ||| '.join(contexts[:5])  # Save up to 5 contexts
             writer.writerow([
                 gavilan_idiom,
@@ -171,13 +230,12 @@ def main():
                 'exact',
                 len(contexts),
                 contexts_str,
-                gav_data['idiomatic_meaning'],
-                gav_data['idiomatic_meaning_translation']
+                gav_df.at[gavilan_idiom, 'idiomatic_meaning'],
+                gav_df.at[gavilan_idiom, 'idiomatic_meaning_translation']
             ])
 
         # Write partial matches
         for gavilan_idiom, id10m_idiom, contexts in partial_matches:
-            gav_data = gavilan_idioms[gavilan_idiom]
             contexts_str = ' ||| '.join(contexts[:5])
             writer.writerow([
                 gavilan_idiom,
@@ -185,8 +243,8 @@ def main():
                 'partial',
                 len(contexts),
                 contexts_str,
-                gav_data['idiomatic_meaning'],
-                gav_data['idiomatic_meaning_translation']
+                gav_df.at[gavilan_idiom, 'idiomatic_meaning'],
+                gav_df.at[gavilan_idiom, 'idiomatic_meaning_translation']
             ])
 
     print(f"✓ Saved {len(matches) + len(partial_matches)} matched idioms to: {matched_file}")
@@ -205,8 +263,8 @@ def main():
     print("SUMMARY")
     print("="*80)
     print(f"Total ID10M Spanish idioms: {len(idiom_contexts)}")
-    print(f"Total Gavilán idioms: {len(gavilan_idioms)}")
-    print(f"Matched with contexts: {len(matches) + len(partial_matches)} ({(len(matches)+len(partial_matches))/len(gavilan_idioms)*100:.1f}%)")
+    print(f"Total Gavilán idioms: {len(gav_df)}")
+    print(f"Matched with contexts: {len(matches) + len(partial_matches)} ({(len(matches)+len(partial_matches))/len(gav_df)*100:.1f}%)")
 
     return len(matches) + len(partial_matches)
 
@@ -12,6 +12,11 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from config import SPANISH_SUBTITLES, PROCESSED_DATA_DIR
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 def normalize_text(text):
     """Normalize text for matching."""
     # Convert to lowercase and remove extra punctuation
@@ -19,6 +24,20 @@ def normalize_text(text):
     text = re.sub(r'[¿?¡!]', '', text)
     return text.strip()
 
+def compile_idiom_pattern(idiom_norm):
+    """Precompile the words-in-order pattern for one normalized idiom.
+
+    Returns None for single-word idioms, which only match as plain
+    substrings.
+    """
+    idiom_words = idiom_norm.split()
+    if len(idiom_words) <= 1:
+        return None
+
+    # Check if main content words appear in order
+    return re.compile(r'\b' + r'\b.*\b'.join(re.escape(word) for word in idiom_words) + r'\b')
+
+
 def find_idiom_in_context(idiom, text):
     """Check if idiom appears in text with flexible matching."""
     idiom_norm = normalize_text(idiom)
@@ -29,13 +48,8 @@ def find_idiom_in_context(idiom, text):
         return True
 
     # Try with different punctuation
-    idiom_words = idiom_norm.split()
-    if len(idiom_words) <= 1:
-        return False
-
-    # Check if main content words appear in order
-    pattern = r'\b' + r'\b.*\b'.join(re.escape(word) for word in idiom_words) + r'\b'
-    return bool(re.search(pattern, text_norm))
+    pattern = compile_idiom_pattern(idiom_norm)
+    return pattern is not None and bool(pattern.search(text_norm))
 
 def find_contexts_for_idioms():
     """Find usage contexts for Spanish idioms in subtitle corpus."""
@@ -71,13 +85,57 @@ def find_contexts_for_idioms():
 
     idiom_contexts = defaultdict(list)
 
-    for i, idiom in enumerate(idioms):
-        if (i + 1) % 100 == 0:
-            print(f"Processed {i+1}/{len(idioms)} idioms...")
-
-        for subtitle in subtitles:
-            if find_idiom_in_context(idiom, subtitle):
-                idiom_contexts[idiom].append(subtitle)
+    # Normalize both sides once: find_idiom_in_context renormalized
+    # the idiom and the subtitle (and rebuilt the regex) per pair
+    idiom_norms = [normalize_text(idiom) for idiom in idioms]
+    norm_subs = [normalize_text(subtitle) for subtitle in subtitles]
+
+    if ahocorasick is not None:
+        # One automaton over all normalized idioms finds every
+        # substring occurrence in a single C pass per subtitle,
+        # instead of len(idioms) x len(subtitles) Python-level checks
+        automaton = ahocorasick.Automaton()
+        for idx, idiom_norm in enumerate(idiom_norms):
+            if idiom_norm:
+                automaton.add_word(idiom_norm, idx)
+        automaton.make_automaton()
+
+        for subtitle, sub_norm in zip(subtitles, norm_subs):
+            seen = set()  # an idiom can occur twice in one line
+            for _, idx in automaton.iter(sub_norm):
+                if idx not in seen:
+                    seen.add(idx)
+                    idiom_contexts[idioms[idx]].append(subtitle)
+
+        # The flexible word-order regex only runs for idioms the
+        # substring pass never found anywhere
+        residual = [i for i, idiom in enumerate(idioms)
+                    if idiom not in idiom_contexts]
+        print(f"Substring pass matched {len(idioms) - len(residual)} idioms;"
+              f" regex fallback for {len(residual)}...")
+
+        for count, idx in enumerate(residual, 1):
+            if count % 100 == 0:
+                print(f"Processed {count}/{len(residual)} residual idioms...")
+            # Compiled once per idiom, not once per pair; None means a
+            # single-word idiom the substring pass has already ruled out
+            pattern = compile_idiom_pattern(idiom_norms[idx])
+            if pattern is None:
+                continue
+            idiom = idioms[idx]
+            for subtitle, sub_norm in zip(subtitles, norm_subs):
+                if pattern.search(sub_norm):
+                    idiom_contexts[idiom].append(subtitle)
+    else:
+        for i, idiom in enumerate(idioms):
+            if (i + 1) % 100 == 0:
+                print(f"Processed {i+1}/{len(idioms)} idioms...")
+
+            idiom_norm = idiom_norms[i]
+            pattern = compile_idiom_pattern(idiom_norm)
+            for subtitle, sub_norm in zip(subtitles, norm_subs):
+                if idiom_norm in sub_norm or (pattern is not None and pattern.search(sub_norm)):
+                    idiom_contexts[idiom].append(subtitle)
 
     # Statistics
     found_count = sum(1 for contexts in idiom_contexts.values() if contexts)
@@ -0,0 +1,477 @@
+"""
+Shared cross-lingual semantic similarity analysis.
+
+Used by analyze_cross_lingual_similarity.py (English ↔ French) and
+analyze_finnish_japanese_similarity.py (English ↔ Finnish/Japanese) so
+the blocked similarity kernel, top-k selection, and output writers are
+maintained in one place.
+"""
+import os
+import pickle
+import json
+import csv
+import gc
+from pathlib import Path
+import numpy as np
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import cupy as cp
+    cp.cuda.runtime.getDeviceCount()
+except Exception:
+    cp = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fused_block_update(block, row0, heap_vals, heap_idx, best_vals, best_idx):
+        """Update the global top-k min-heap and per-column best in one pass."""
+        block_rows, m = block.shape
+
+        # Per-column best-so-far, parallel over columns
+        for j in prange(m):
+            for i in range(block_rows):
+                v = block[i, j]
+                if v > best_vals[j]:
+                    best_vals[j] = v
+                    best_idx[j] = row0 + i
+
+        # Global top-k min-heap over the flattened block
+        k = heap_vals.size
+        for i in range(block_rows):
+            base = (row0 + i) * m
+            for j in range(m):
+                v = block[i, j]
+                if v > heap_vals[0]:
+                    heap_vals[0] = v
+                    heap_idx[0] = base + j
+                    pos = 0
+                    while True:
+                        left = 2 * pos + 1
+                        right = left + 1
+                        smallest = pos
+                        if left < k and heap_vals[left] < heap_vals[smallest]:
+                            smallest = left
+                        if right < k and heap_vals[right] < heap_vals[smallest]:
+                            smallest = right
+                        if smallest == pos:
+                            break
+                        heap_vals[pos], heap_vals[smallest] = heap_vals[smallest], heap_vals[pos]
+                        heap_idx[pos], heap_idx[smallest] = heap_idx[smallest], heap_idx[pos]
+                        pos = smallest
+
+if njit is not None:
+    @njit(cache=True)
+    def _stats_and_hist(flat, thresholds):
+        """Welford mean/std, min/max and threshold counts in one sweep."""
+        mean = 0.0
+        m2 = 0.0
+        vmin = flat[0]
+        vmax = flat[0]
+        counts = np.zeros(thresholds.size, dtype=np.int64)
+        for i in range(flat.size):
+            v = flat[i]
+            delta = v - mean
+            mean += delta / (i + 1)
+            m2 += delta * (v - mean)
+            if v < vmin:
+                vmin = v
+            if v > vmax:
+                vmax = v
+            # thresholds are ascending, so stop at the first miss
+            for t in range(thresholds.size):
+                if v >= thresholds[t]:
+                    counts[t] += 1
+                else:
+                    break
+        return mean, np.sqrt(m2 / flat.size), vmin, vmax, counts
+
+def _median_partition(flat):
+    """Median via a single O(n) partition instead of a full sort."""
+    mid = flat.size // 2
+    part = np.partition(flat, mid)
+    if flat.size % 2:
+        return part[mid]
+    return 0.5 * (float(part[mid]) + float(part[:mid].max()))
+
+def load_embeddings(embedding_file):
+    """Load saved embeddings.
+
+    Prefers a .npy matrix (memory-mapped, so the OS pages in only the
+    rows actually touched) with a JSON idiom sidecar, converting the
+    legacy pickle once on first use.
+    """
+    embedding_file = Path(embedding_file)
+    npy_file = embedding_file.with_suffix('.npy')
+    idioms_file = embedding_file.with_suffix('.idioms.json')
+
+    if not (npy_file.exists() and idioms_file.exists()):
+        # One-time conversion so later runs skip the unpickler entirely.
+        # Written to temp files and published with os.replace: the
+        # language-pair workers all convert the shared English pickle on
+        # the first post-migration run, and a concurrent reader must see
+        # either no file (and convert itself) or a complete one — never
+        # a torn mmap or truncated JSON.
+        with open(embedding_file, 'rb') as f:
+            data = pickle.load(f)
+        tmp_npy = npy_file.with_name(npy_file.name + f'.{os.getpid()}.tmp')
+        tmp_idioms = idioms_file.with_name(idioms_file.name + f'.{os.getpid()}.tmp')
+        with open(tmp_npy, 'wb') as f:
+            np.save(f, np.asarray(data['embeddings']))
+        with open(tmp_idioms, 'w', encoding='utf-8') as f:
+            json.dump(data['idioms'], f, ensure_ascii=False)
+        os.replace(tmp_idioms, idioms_file)
+        os.replace(tmp_npy, npy_file)
+
+    with open(idioms_file, 'r', encoding='utf-8') as f:
+        idioms = json.load(f)
+    return {'idioms': idioms, 'embeddings': np.load(npy_file, mmap_mode='r')}
+
+def dump_json(obj, path):
+    """Write results as indented UTF-8 JSON, via orjson's C encoder when available."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+
+def normalize_embeddings(embeddings):
+    """L2-normalize an embedding matrix once so cosine reduces to a dot product."""
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return np.nan_to_num(normalized, copy=False)
+
+def quantize_embeddings_int8(embeddings):
+    """Scalar-quantize normalized embeddings to int8 with per-vector scales.
+
+    Cosine similarity is invariant to per-vector scaling, so the scales
+    drop out and the int8 vectors can be compared directly by SimSIMD's
+    VNNI/NEON int8 cosine kernels.
+    """
+    scales = np.max(np.abs(embeddings), axis=1, keepdims=True) / 127.0
+    scales[scales == 0] = 1.0
+    return np.round(embeddings / scales).astype(np.int8)
+
+BLOCK_ROWS = 256  # rows per GEMM tile; keeps block rows resident in L2
+
+def compute_similarities_and_topk(en_embeddings, target_embeddings, k):
+    """Blocked similarity computation fused with global top-k selection.
+
+    Tiles the GEMM over blocks of English rows, gathering each block's
+    top-k candidates and the per-column best English row while the
+    block is still cache-hot. The full matrix is written into a single
+    preallocated buffer (the statistics pass still reads it); no
+    per-block temporaries survive.
+
+    Returns (similarities, top_en_idx, top_tgt_idx, best_en_per_target,
+    best_sim_per_target).
+    """
+    n = en_embeddings.shape[0]
+    m = target_embeddings.shape[0]
+    k = min(k, n * m)
+
+    if cp is not None:
+        # One SGEMM on cuBLAS plus device-side top-k / argmax; only the
+        # result matrix and the index arrays cross the PCIe bus back.
+        en_g = cp.asarray(en_embeddings)
+        tgt_g = cp.asarray(target_embeddings)
+        sims_g = en_g @ tgt_g.T
+        flat = sims_g.ravel()
+        part = cp.argpartition(flat, flat.size - k)[-k:]
+        top_idx = cp.asnumpy(part[cp.argsort(-flat[part])])
+        best_idx = cp.asnumpy(sims_g.argmax(axis=0)).astype(np.int64)
+        similarities = cp.asnumpy(sims_g)
+        best_vals = similarities[best_idx, np.arange(m)]
+        top_en_idx, top_tgt_idx = np.unravel_index(top_idx, (n, m))
+        return similarities, top_en_idx, top_tgt_idx, best_idx, best_vals
+
+    similarities = np.empty((n, m), dtype=np.float32)
+    target_t = target_embeddings.T
+
+    if simsimd is not None:
+        # int8 halves the bytes streamed through the kernel and maps to
+        # VNNI/SDOT dot-product instructions; rank order is robust to
+        # int8 quantization for sentence-transformer embeddings.
+        en_embeddings = quantize_embeddings_int8(en_embeddings)
+        target_embeddings = quantize_embeddings_int8(target_embeddings)
+
+    best_idx = np.zeros(m, dtype=np.int64)
+    best_vals = np.full(m, -np.inf, dtype=np.float32)
+    if njit is not None:
+        heap_vals = np.full(k, -np.inf, dtype=np.float32)
+        heap_idx = np.zeros(k, dtype=np.int64)
+    else:
+        cand_sims = []
+        cand_idx = []
+        col_range = np.arange(m)
+
+    for row0 in range(0, n, BLOCK_ROWS):
+        row1 = min(row0 + BLOCK_ROWS, n)
+        block = similarities[row0:row1]
+        if simsimd is not None:
+            block[:] = 1.0 - np.asarray(
+                simsimd.cdist(en_embeddings[row0:row1], target_embeddings, metric='cosine'))
+        else:
+            np.matmul(en_embeddings[row0:row1], target_t, out=block)
+
+        # Update top-k candidates and per-column best while the block
+        # is cache-hot; with Numba both run in one fused parallel kernel
+        if njit is not None:
+            _fused_block_update(block, row0, heap_vals, heap_idx, best_vals, best_idx)
+        else:
+            flat = block.ravel()
+            block_k = min(k, flat.size)
+            part = np.argpartition(flat, -block_k)[-block_k:]
+            cand_sims.append(flat[part])
+            cand_idx.append(part + row0 * m)
+
+            block_best = block.argmax(axis=0)
+            block_vals = block[block_best, col_range]
+            improved = block_vals > best_vals
+            best_idx[improved] = block_best[improved] + row0
+            best_vals[improved] = block_vals[improved]
+
+    if njit is not None:
+        top_idx = heap_idx[np.argsort(-heap_vals)]
+    else:
+        cand_sims = np.concatenate(cand_sims)
+        cand_idx = np.concatenate(cand_idx)
+        top_idx = cand_idx[np.argsort(-cand_sims)[:k]]
+    top_en_idx, top_tgt_idx = np.unravel_index(top_idx, (n, m))
+    return similarities, top_en_idx, top_tgt_idx, best_idx, best_vals
+
+def analyze_language_pair(en_idiom_str, en_ctx_str, en_embeddings, target_idioms, target_embeddings, lang_name, lang_code, top_display=30, output_names=None):
+    """Analyze cross-lingual similarity between English and target language.
+
+    en_idiom_str / en_ctx_str are precomputed per-idiom strings shared
+    across language pairs, so the English metadata is walked only once.
+    output_names optionally overrides the (similarities_json,
+    similarities_csv, best_matches_json) filenames under data/results —
+    the EN↔FR run predates the english_{lang_code}_* scheme and keeps
+    its original artifact names.
+    """
+
+    print("=" * 80)
+    print(f"ENGLISH ↔ {lang_name.upper()} SEMANTIC SIMILARITY")
+    print("=" * 80)
+
+    # Struct-of-arrays view of the target metadata, with the
+    # first-element-or-empty guard evaluated once per idiom
+    tgt_idiom_str = [d['idiom'] for d in target_idioms]
+    tgt_ctx_str = [(d['contexts'] or [''])[0] for d in target_idioms]
+    tgt_trans_str = [(d.get('english_translations') or [''])[0] for d in target_idioms]
+
+    print(f"\nCalculating cosine similarities...")
+    print(f"English idioms: {len(en_idiom_str):,}")
+    print(f"{lang_name} idioms: {len(target_idioms):,}")
+    print(f"Matrix size: {len(en_idiom_str):,} × {len(target_idioms):,} = {len(en_idiom_str) * len(target_idioms):,} comparisons")
+
+    similarities, top_en_idx, top_tgt_idx, best_en_for_tgt, best_sims = \
+        compute_similarities_and_topk(en_embeddings, target_embeddings, 100)
+    print(f"✓ Computed similarity matrix: {similarities.shape}")
+
+    # Find top matches
+    print(f"\n{'=' * 80}")
+    print(f"TOP {top_display} ENGLISH ↔ {lang_name.upper()} MATCHES")
+    print("=" * 80)
+
+    # Top K pairs were selected during the blocked similarity pass.
+    # Keep them as compact (sim, en, tgt) triples — 12 bytes each —
+    # and attach strings only when the K survivor dicts are built.
+    num_pairs = similarities.size
+    top_pairs = np.empty(len(top_en_idx), dtype=[('sim', 'f4'), ('en', 'i4'), ('tgt', 'i4')])
+    top_pairs['sim'] = similarities[top_en_idx, top_tgt_idx]
+    top_pairs['en'] = top_en_idx
+    top_pairs['tgt'] = top_tgt_idx
+
+    fieldnames = ('english_idiom', 'english_context', f'{lang_code}_idiom',
+                  f'{lang_code}_context', 'english_translation', 'similarity')
+
+    all_matches_sorted = []
+    for sim, en_idx, tgt_idx in top_pairs:
+        all_matches_sorted.append({
+            'english_idiom': en_idiom_str[en_idx],
+            'english_context': en_ctx_str[en_idx],
+            f'{lang_code}_idiom': tgt_idiom_str[tgt_idx],
+            f'{lang_code}_context': tgt_ctx_str[tgt_idx],
+            'english_translation': tgt_trans_str[tgt_idx],
+            'similarity': float(sim)
+        })
+
+    # Display the top matches
+    print(f"\nMost semantically similar English ↔ {lang_name} idiom pairs:\n")
+
+    for i, match in enumerate(all_matches_sorted[:top_display], 1):
+        print(f"{i:2d}. Similarity: {match['similarity']:.4f}")
+        print(f"    EN: {match['english_idiom']}")
+        print(f"    {lang_code.upper()}: {match[f'{lang_code}_idiom']}")
+        print(f"    EN context: {match['english_context'][:80]}...")
+        print(f"    {lang_code.upper()} context: {match[f'{lang_code}_context'][:80]}...")
+        print(f"    {lang_code.upper()}→EN translation: {match['english_translation'][:80]}...")
+        print()
+
+    # Save results
+    output_dir = Path("data/results")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if output_names is None:
+        output_names = (f"english_{lang_code}_similarities.json",
+                        f"english_{lang_code}_similarities.csv",
+                        f"{lang_code}_best_english_matches.json")
+    similarities_json_name, similarities_csv_name, best_json_name = output_names
+
+    output_json = output_dir / similarities_json_name
+    dump_json(all_matches_sorted[:100], output_json)
+    print(f"✓ Saved top 100 matches to: {output_json}")
+
+    output_csv = output_dir / similarities_csv_name
+    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
+        # csv.writer over plain tuples pulled straight from the column
+        # lists — no per-row, per-field dict lookups as with DictWriter
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            (en_idiom_str[en_idx], en_ctx_str[en_idx], tgt_idiom_str[tgt_idx],
+             tgt_ctx_str[tgt_idx], tgt_trans_str[tgt_idx], float(sim))
+            for sim, en_idx, tgt_idx in top_pairs[:100])
+    print(f"✓ Saved to CSV: {output_csv}")
+
+    # Find best English match for each target language idiom
+    print(f"\n{'=' * 80}")
+    print(f"BEST ENGLISH MATCH FOR EACH {lang_name.upper()} IDIOM")
+    print("=" * 80)
+
+    # Per-column best matches were maintained during the blocked
+    # similarity pass
+    target_best_matches = []
+
+    for tgt_idx in range(len(tgt_idiom_str)):
+        best_en_idx = best_en_for_tgt[tgt_idx]
+        best_sim = best_sims[tgt_idx]
+
+        target_best_matches.append({
+            f'{lang_code}_idiom': tgt_idiom_str[tgt_idx],
+            f'{lang_code}_context': tgt_ctx_str[tgt_idx],
+            'english_translation': tgt_trans_str[tgt_idx],
+            'best_english_match': en_idiom_str[best_en_idx],
+            'english_context': en_ctx_str[best_en_idx],
+            'similarity': float(best_sim)
+        })
+
+    # Sort by similarity
+    target_best_matches_sorted = sorted(target_best_matches, key=lambda x: x['similarity'], reverse=True)
+
+    print(f"\nTop 20 {lang_name} idioms with their best English semantic match:\n")
+
+    for i, match in enumerate(target_best_matches_sorted[:20], 1):
+        print(f"{i:2d}. Similarity: {match['similarity']:.4f}")
+        print(f"    {lang_code.upper()}: {match[f'{lang_code}_idiom']}")
+        print(f"    EN: {match['best_english_match']}")
+        print(f"    {lang_code.upper()}→EN translation: {match['english_translation'][:80]}...")
+        print()
+
+    # Save
+    output_best_json = output_dir / best_json_name
+    dump_json(target_best_matches_sorted, output_best_json)
+    print(f"✓ Saved all {lang_name}→English best matches to: {output_best_json}")
+
+    # Statistics
+    print(f"\n{'=' * 80}")
+    print(f"SIMILARITY STATISTICS")
+    print("=" * 80)
+
+    thresholds = [0.3, 0.4, 0.5, 0.6, 0.7, 0.8]
+    target_best_sims = [m['similarity'] for m in target_best_matches]
+
+    # One streaming pass for mean/std/min/max and the threshold counts
+    # instead of a separate full sweep per statistic, plus a single
+    # O(n) partition for the median. ravel() is a view on the
+    # contiguous matrix — no second N×M buffer.
+    all_sims = similarities.ravel()
+    if njit is not None:
+        sim_mean, sim_std, sim_min, sim_max, thresh_counts = \
+            _stats_and_hist(all_sims, np.asarray(thresholds, dtype=np.float32))
+    else:
+        sim_mean = all_sims.mean(dtype=np.float64)
+        sim_std = all_sims.std(dtype=np.float64)
+        sim_min = all_sims.min()
+        sim_max = all_sims.max()
+        thresh_counts = [np.count_nonzero(all_sims >= thresh) for thresh in thresholds]
+    sim_median = _median_partition(all_sims)
+
+    print(f"\nAll English ↔ {lang_name} similarities:")
+    print(f"  Mean:   {sim_mean:.4f}")
+    print(f"  Median: {sim_median:.4f}")
+    print(f"  Std:    {sim_std:.4f}")
+    print(f"  Min:    {sim_min:.4f}")
+    print(f"  Max:    {sim_max:.4f}")
+
+    print(f"\nBest match for each {lang_name} idiom:")
+    print(f"  Mean:   {np.mean(target_best_sims):.4f}")
+    print(f"  Median: {np.median(target_best_sims):.4f}")
+    print(f"  Min:    {np.min(target_best_sims):.4f}")
+    print(f"  Max:    {np.max(target_best_sims):.4f}")
+
+    # Similarity distribution
+    print(f"\nSimilarity distribution (all pairs):")
+    for thresh, count in zip(thresholds, thresh_counts):
+        pct = count / num_pairs * 100
+        print(f"  >= {thresh:.1f}: {count:7,} ({pct:5.2f}%)")
+
+    print(f"\nSimilarity distribution (best match per {lang_name} idiom):")
+    for thresh in thresholds:
+        count = sum(1 for s in target_best_sims if s >= thresh)
+        pct = count / len(target_best_sims) * 100
+        print(f"  >= {thresh:.1f}: {count:4d} ({pct:5.1f}%)")
+
+    # Drop the N×M matrix now so it is reclaimed before the next
+    # language pair allocates its own
+    del similarities
+    gc.collect()
+
+    return num_pairs, target_best_matches_sorted
+
+
+def run_language_pair(target_pkl_name, lang_name, lang_code, top_display=30, output_names=None):
+    """Load one language pair (memory-mapped) and run the full analysis."""
+    emb_dir = Path("data/embeddings")
+
+    print(f"[{lang_code}] Loading English embeddings...")
+    en_data = load_embeddings(emb_dir / "english_idiom_embeddings.pkl")
+    en_idioms = en_data['idioms']
+    # Normalize each embedding matrix exactly once per worker; the .npy
+    # backing file itself is shared read-only across processes.
+    en_embeddings = normalize_embeddings(en_data['embeddings'])
+    # Precompute the English strings used in every match dict so the
+    # list of dicts is not re-walked while building output rows
+    en_idiom_str = [i['idiom'] for i in en_idioms]
+    en_ctx_str = [(i['contexts'] or [''])[0] for i in en_idioms]
+    print(f"[{lang_code}] ✓ Loaded {len(en_idioms):,} English idioms")
+
+    print(f"[{lang_code}] Loading {lang_name} embeddings...")
+    target_data = load_embeddings(emb_dir / target_pkl_name)
+    target_idioms = target_data['idioms']
+    target_embeddings = normalize_embeddings(target_data['embeddings'])
+    print(f"[{lang_code}] ✓ Loaded {len(target_idioms):,} {lang_name} idioms\n")
+
+    count, _ = analyze_language_pair(
+        en_idiom_str, en_ctx_str, en_embeddings,
+        target_idioms, target_embeddings,
+        lang_name, lang_code, top_display=top_display, output_names=output_names
+    )
+    return count
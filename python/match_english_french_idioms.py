@@ -10,7 +10,12 @@ import csv
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+import torch
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
 
 def load_english_idioms(magpie_file):
     """Load English idioms from MAGPIE with contexts."""
@@ -83,8 +88,13 @@ def main():
     print("=" * 80)
     print("\nModel: paraphrase-multilingual-mpnet-base-v2")
 
-    model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2')
-    print("✓ Model loaded")
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2', device=device)
+    if device == 'cuda':
+        # fp16 halves memory traffic and roughly doubles throughput on
+        # tensor cores; encoding quality is unaffected at this scale
+        model.half()
+    print(f"✓ Model loaded (device: {device})")
 
     # Create representations
     print("\n" + "=" * 80)
@@ -98,7 +108,10 @@ def main():
     print(f"Sample English representation:\n  {english_texts[0][:150]}...\n")
 
     print("Encoding English idioms...")
-    english_embeddings = model.encode(english_texts, show_progress_bar=True)
+    english_embeddings = model.encode(english_texts, batch_size=256,
+                                      show_progress_bar=True,
+                                      convert_to_numpy=True,
+                                      normalize_embeddings=True)
     print(f"✓ Encoded {len(english_embeddings):,} English idioms")
 
     print("\nCreating French representations...")
@@ -108,7 +121,10 @@ def main():
     print(f"Sample French representation:\n  {french_texts[0][:150]}...\n")
 
     print("Encoding French idioms...")
-    french_embeddings = model.encode(french_texts, show_progress_bar=True)
+    french_embeddings = model.encode(french_texts, batch_size=256,
+                                     show_progress_bar=True,
+                                     convert_to_numpy=True,
+                                     normalize_embeddings=True)
     print(f"✓ Encoded {len(french_embeddings):,} French idioms")
 
     # Compute similarities
@@ -117,8 +133,28 @@ def main():
     print("=" * 80)
 
     print("\nCalculating cosine similarities...")
-    similarities = cosine_similarity(english_embeddings, french_embeddings)
-    print(f"✓ Similarity matrix shape: {similarities.shape}")
+    # Embeddings are L2-normalized at encode time, so cosine similarity
+    # is inner product — no per-pair norm recomputation
+    english_embeddings = np.ascontiguousarray(english_embeddings, dtype=np.float32)
+    french_embeddings = np.ascontiguousarray(french_embeddings, dtype=np.float32)
+
+    if faiss is not None:
+        # IndexFlatIP fuses the GEMM with a partial top-k heap: only
+        # the |E|x5 result buffer exists, never the full |E|x|F| matrix
+        index = faiss.IndexFlatIP(french_embeddings.shape[1])
+        index.add(french_embeddings)
+        top_scores, top_idx = index.search(english_embeddings, 5)
+        print(f"✓ Retrieved top-5 neighbours from {index.ntotal:,} French vectors via FAISS")
+    else:
+        similarities = english_embeddings @ french_embeddings.T
+        print(f"✓ Similarity matrix shape: {similarities.shape}")
+        # argpartition is O(|F|) per row versus a full O(|F| log|F|)
+        # sort; only the 5 survivors get ordered
+        top_idx = np.argpartition(similarities, -5, axis=1)[:, -5:]
+        row_order = np.argsort(
+            np.take_along_axis(similarities, top_idx, axis=1), axis=1)[:, ::-1]
+        top_idx = np.take_along_axis(top_idx, row_order, axis=1)
+        top_scores = np.take_along_axis(similarities, top_idx, axis=1)
 
     # Find best matches for each English idiom
     print("\n" + "=" * 80)
@@ -128,18 +164,15 @@ def main():
     matches = []
 
     for i, eng_idiom in enumerate(english_idioms):
-        # Get top 5 matches for this English idiom
-        sim_scores = similarities[i]
-        top_indices = np.argsort(sim_scores)[-5:][::-1]
-
-        for rank, fr_idx in enumerate(top_indices, 1):
+        # Top 5 matches for this English idiom
+        for rank, (fr_idx, score) in enumerate(zip(top_idx[i], top_scores[i]), 1):
             matches.append({
                 'english_idiom': eng_idiom['idiom'],
                 'english_context': eng_idiom['contexts'][0] if eng_idiom['contexts'] else '',
                 'french_idiom': french_idioms[fr_idx]['idiom'],
                 'french_context': french_idioms[fr_idx]['contexts'][0] if french_idioms[fr_idx]['contexts'] else '',
                 'english_translation': french_idioms[fr_idx]['english_translations'][0] if french_idioms[fr_idx]['english_translations'] else '',
-                'similarity': float(sim_scores[fr_idx]),
+                'similarity': float(score),
                 'rank': rank
             })
 
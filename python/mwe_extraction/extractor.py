@@ -1,6 +1,7 @@
 """
 Multi-Word Expression (MWE) extraction from text.
 """
+import os
 import spacy
 from typing import List, Dict, Tuple, Set
 from collections import Counter
@@ -25,34 +26,38 @@ class MWEExtractor:
             print(f"Model {spacy_model} not found. Download it with: python -m spacy download {spacy_model}")
             self.nlp = None
 
-    def extract_ngrams(self, texts: List[str], n: int = 3, min_freq: int = 2) -> List[Tuple[str, int]]:
+    def extract_ngrams(self, tokenized: List[List[str]], n: int = 3, min_freq: int = 2) -> List[Tuple[str, int]]:
         """
-        Extract n-grams from texts based on frequency.
+        Extract n-grams from pre-tokenized texts based on frequency.
 
         Args:
-            texts: List of text strings
+            tokenized: List of lowercased token lists, one per text
             n: N-gram size
             min_freq: Minimum frequency threshold
 
         Returns:
             List of (ngram, frequency) tuples, sorted by frequency
         """
-        ngrams = []
-
-        for text in texts:
-            words = text.lower().split()
-            for i in range(len(words) - n + 1):
-                ngram = ' '.join(words[i:i+n])
-                ngrams.append(ngram)
-
-        # Count frequencies
-        ngram_counts = Counter(ngrams)
+        ngram_counts = self.count_ngrams(tokenized, n)
 
         # Filter by minimum frequency
         filtered = [(ng, count) for ng, count in ngram_counts.items() if count >= min_freq]
 
         return sorted(filtered, key=lambda x: x[1], reverse=True)
 
+    @staticmethod
+    def count_ngrams(tokenized: List[List[str]], n: int) -> Counter:
+        """Count all n-grams of one size across pre-tokenized texts."""
+        ngram_counts = Counter()
+
+        for words in tokenized:
+            # zip over n shifted views walks every window without a
+            # per-position list slice; Counter.update counts as it goes
+            # instead of accumulating one big intermediate list
+            ngram_counts.update(map(' '.join, zip(*(words[k:] for k in range(n)))))
+
+        return ngram_counts
+
     def extract_noun_phrases(self, texts: List[str]) -> List[str]:
         """
         Extract noun phrases using spaCy's parser.
@@ -66,15 +71,17 @@ class MWEExtractor:
         if self.nlp is None:
             return []
 
-        noun_phrases = []
-
-        for text in texts:
-            doc = self.nlp(text)
-            for chunk in doc.noun_chunks:
-                if len(chunk.text.split()) >= 2:  # Only multi-word
-                    noun_phrases.append(chunk.text.lower())
+        # pipe batches tokenization and fans parsing out across
+        # processes; chunking only needs the parser, so NER and
+        # lemmatization are switched off
+        noun_phrases = {
+            chunk.text.lower()
+            for doc in self._pipe(texts)
+            for chunk in doc.noun_chunks
+            if len(chunk.text.split()) >= 2  # Only multi-word
+        }
 
-        return list(set(noun_phrases))
+        return list(noun_phrases)
 
     def extract_verb_phrases(self, texts: List[str]) -> List[str]:
         """
@@ -89,10 +96,9 @@ class MWEExtractor:
         if self.nlp is None:
             return []
 
-        verb_phrases = []
+        verb_phrases = set()
 
-        for text in texts:
-            doc = self.nlp(text)
+        for doc in self._pipe(texts):
             for token in doc:
                 if token.pos_ == "VERB":
                     # Get verb and its children (objects, complements)
@@ -107,9 +113,17 @@ class MWEExtractor:
                                         phrase_tokens.append(grandchild.text)
 
                     if len(phrase_tokens) >= 2:
-                        verb_phrases.append(' '.join(phrase_tokens).lower())
+                        verb_phrases.add(' '.join(phrase_tokens).lower())
+
+        return list(verb_phrases)
 
-        return list(set(verb_phrases))
+    def _pipe(self, texts: List[str]):
+        """Parse texts through nlp.pipe with unused components disabled."""
+        disable = [name for name in ("ner", "lemmatizer")
+                   if name in self.nlp.pipe_names]
+        return self.nlp.pipe(texts, batch_size=128,
+                             n_process=max(1, (os.cpu_count() or 1) // 2),
+                             disable=disable)
 
     def extract_candidate_mwes(
         self,
@@ -132,11 +146,21 @@ class MWEExtractor:
         """
         candidates = {}
 
-        # Extract n-grams for different values of n
+        # Tokenize once — every n-gram size shares the same token
+        # lists instead of re-lowercasing and re-splitting per n
+        tokenized = [text.lower().split() for text in texts]
+
+        # Extract n-grams for different values of n, keeping the full
+        # counters around: phrase frequencies below come from these
+        # O(1) lookups instead of a texts.count scan per candidate
+        # (which also counted whole-document matches, not occurrences)
+        freq_by_len = {}
+
         for n in range(min_length, max_length + 1):
-            ngrams = self.extract_ngrams(texts, n=n, min_freq=min_freq)
-            for ngram, freq in ngrams:
-                if ngram not in candidates:
+            ngram_counts = self.count_ngrams(tokenized, n)
+            freq_by_len[n] = ngram_counts
+            for ngram, freq in ngram_counts.items():
+                if freq >= min_freq and ngram not in candidates:
                     candidates[ngram] = {
                         "frequency": freq,
                         "length": n,
@@ -147,9 +171,10 @@ class MWEExtractor:
         noun_phrases = self.extract_noun_phrases(texts)
         for np in noun_phrases:
             if np not in candidates:
+                n_words = np.count(' ') + 1
                 candidates[np] = {
-                    "frequency": texts.count(np),
-                    "length": len(np.split()),
+                    "frequency": freq_by_len.get(n_words, {}).get(np, 0),
+                    "length": n_words,
                     "type": "noun_phrase"
                 }
 
@@ -157,9 +182,10 @@ class MWEExtractor:
         verb_phrases = self.extract_verb_phrases(texts)
         for vp in verb_phrases:
             if vp not in candidates:
+                n_words = vp.count(' ') + 1
                 candidates[vp] = {
-                    "frequency": texts.count(vp),
-                    "length": len(vp.split()),
+                    "frequency": freq_by_len.get(n_words, {}).get(vp, 0),
+                    "length": n_words,
                     "type": "verb_phrase"
                 }
 